@@ -1,3 +1,7 @@
+import mmap
+import struct
+import sys
+from bisect import bisect_left
 from collections import deque
 
 def get_inversions(puzzle):
@@ -16,19 +20,33 @@ def find_blank_position(puzzle):
                 return r, c
     return -1, -1
 
-def is_solvable(puzzle):
+def goal_state_for(n):
+    """The usual goal: tiles 1..n*n-1 in order with the blank last."""
+    goal_list = list(range(1, n*n))
+    goal_list.append(0)
+    return tuple(tuple(goal_list[i*n : (i+1)*n]) for i in range(n))
+
+def parity_invariant(puzzle):
+    """
+    Parity that no move changes: the inversion count for odd-sized grids
+    (a vertical move jumps a tile over an even number of others), and
+    inversions + blank row for even-sized grids (a vertical move flips both).
+    """
     n = len(puzzle)
     inversions = get_inversions(puzzle)
+    if n % 2 == 1:
+        return inversions % 2
     blank_row, _ = find_blank_position(puzzle)
+    return (inversions + blank_row) % 2
 
-    if n % 2 == 1:
-        # For odd-sized grids (e.g., 3x3), solvable if inversions are even
-        return inversions % 2 == 0
-    else:
-        # For even-sized grids (e.g., 4x4)
-        # Solvable if inversions + blank_row_from_bottom is even
-        blank_row_from_bottom = n - blank_row
-        return (inversions + blank_row_from_bottom) % 2 == 0
+def is_solvable(puzzle, goal=None):
+    """
+    The state can reach goal (default: goal_state_for(n)) exactly when both
+    have the same parity invariant.
+    """
+    if goal is None:
+        goal = goal_state_for(len(puzzle))
+    return parity_invariant(puzzle) == parity_invariant(goal)
 
 def get_neighbors(state):
     neighbors = []
@@ -47,33 +65,636 @@ def get_neighbors(state):
             
     return neighbors
 
-def bfs_n_puzzle(initial_state, goal_state):
-    if not is_solvable(initial_state):
+# Packed state encoding: one int per state, blank position in the low bits
+class PackedPuzzle:
+    """
+    Encodes an n x n state as one int: the tile of cell i (row-major) sits in
+    bits [tile_bits * i, tile_bits * (i + 1)) of the board (4 bits per tile
+    up to 4x4, 5 for 5x5), and key = (board << blank_bits) | blank cell.
+    moves[blank] lists (target cell, target shift, blank shift) for every
+    cell the blank can swap with, so a move is a few shifts and xors:
+    the tile at the target moves into the (all-zero) blank cell.
+    """
+    def __init__(self, n):
+        self.n = n
+        self.tile_bits = max(1, (n * n - 1).bit_length())
+        self.blank_bits = max(1, (n * n - 1).bit_length())
+        self.blank_mask = (1 << self.blank_bits) - 1
+        self.tile_mask = (1 << self.tile_bits) - 1
+        self.moves = []
+        for blank in range(n * n):
+            r, c = divmod(blank, n)
+            targets = [(r + dr) * n + c + dc for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]  # Right, Left, Down, Up
+                       if 0 <= r + dr < n and 0 <= c + dc < n]
+            self.moves.append(tuple((target, self.tile_bits * target, self.tile_bits * blank) for target in targets))
+
+    def pack(self, state):
+        board = 0
+        blank = -1
+        for i, tile in enumerate(tile for row in state for tile in row):
+            board |= tile << (self.tile_bits * i)
+            if tile == 0:
+                blank = i
+        return (board << self.blank_bits) | blank
+
+    def unpack(self, key):
+        board = key >> self.blank_bits
+        tiles = [(board >> (self.tile_bits * i)) & self.tile_mask for i in range(self.n * self.n)]
+        return tuple(tuple(tiles[r * self.n:(r + 1) * self.n]) for r in range(self.n))
+
+    def neighbors(self, key):
+        """Keys of the states one move away."""
+        blank_bits, tile_mask = self.blank_bits, self.tile_mask
+        board = key >> blank_bits
+        result = []
+        for target, target_shift, blank_shift in self.moves[key & self.blank_mask]:
+            tile = (board >> target_shift) & tile_mask
+            result.append(((board ^ (tile << target_shift) ^ (tile << blank_shift)) << blank_bits) | target)
+        return result
+
+def reconstruct_path(parents, state):
+    """Follows the parent map back from state to the start (whose parent is None)."""
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parents[state]
+    path.reverse()
+    return path
+
+def bfs_n_puzzle(initial_state, goal_state, verbose=False, stats=None):
+    """
+    Breadth-first search from initial_state to goal_state. States are packed
+    into ints (PackedPuzzle), so the queue and the parent map hold small ints
+    and a move is a table lookup plus a few bit operations. Each visited
+    state keeps only its predecessor (parents doubles as the visited set);
+    the path is rebuilt and unpacked once the goal is dequeued. verbose
+    prints every processed state; if stats is a dict it receives 'visited'.
+    """
+    if not is_solvable(initial_state, goal_state):
         return None, "This puzzle is unsolvable."
     
-    queue = deque([(initial_state, [])]) # (state, path)
-    visited = {initial_state}
+    packing = PackedPuzzle(len(initial_state))
+    neighbors = packing.neighbors
+    start, goal = packing.pack(initial_state), packing.pack(goal_state)
+    queue = deque([start])
+    parents = {start: None}  # Format: {state key: predecessor key}
     step_count = 0
 
     while queue:
-        current_state, path = queue.popleft()
+        current = queue.popleft()
         step_count += 1
         
-        print(f"\nProcessing Step {step_count}:")
-        for row in current_state:
-            print(row)
+        if verbose:
+            print(f"\nProcessing Step {step_count}:")
+            for row in packing.unpack(current):
+                print(row)
         
-        if current_state == goal_state:
-            return path + [current_state], "Solution found!"
-
-        for neighbor in get_neighbors(current_state):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                new_path = path + [current_state]
-                queue.append((neighbor, new_path))
+        if current == goal:
+            if stats is not None:
+                stats["visited"] = len(parents)
+            return [packing.unpack(key) for key in reconstruct_path(parents, current)], "Solution found!"
+
+        for neighbor in neighbors(current):
+            if neighbor not in parents:
+                parents[neighbor] = current
+                queue.append(neighbor)
                 
     return None, "Solution not found (shouldn't happen for solvable puzzles)."
 
+def bidirectional_bfs_n_puzzle(initial_state, goal_state, stats=None):
+    """
+    Breadth-first search from both ends at once. Each round expands one full
+    layer of whichever frontier is smaller. Every generated state already
+    seen by the other side is a meeting point; the round is still finished
+    and the meeting point with the shortest total length is kept, which makes
+    the result optimal. The two half-paths are stitched through the parent
+    maps. If stats is a dict it receives 'visited' (states stored on both sides).
+    Returns (path of states, message) like bfs_n_puzzle.
+    """
+    if not is_solvable(initial_state, goal_state):
+        return None, "This puzzle is unsolvable."
+
+    packing = PackedPuzzle(len(initial_state))
+    neighbors = packing.neighbors
+    start, goal = packing.pack(initial_state), packing.pack(goal_state)
+    parents = ({start: None}, {goal: None})  # Format: {state key: predecessor key}, per side
+    depths = ({start: 0}, {goal: 0})
+    frontiers = ([start], [goal])
+    meeting, best = (start, 0) if start == goal else (None, None)
+
+    while meeting is None and frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own_parents, own_depths = parents[side], depths[side]
+        other_depths = depths[1 - side]
+        layer = []
+        for current in frontiers[side]:
+            depth = own_depths[current] + 1
+            for neighbor in neighbors(current):
+                if neighbor in own_parents:
+                    continue
+                own_parents[neighbor] = current
+                own_depths[neighbor] = depth
+                layer.append(neighbor)
+                if neighbor in other_depths and (best is None or depth + other_depths[neighbor] < best):
+                    meeting, best = neighbor, depth + other_depths[neighbor]
+        frontiers = (layer, frontiers[1]) if side == 0 else (frontiers[0], layer)
+
+    if stats is not None:
+        stats["visited"] = len(parents[0]) + len(parents[1])
+    if meeting is None:
+        return None, "Solution not found (shouldn't happen for solvable puzzles)."
+    path = reconstruct_path(parents[0], meeting)
+    path.extend(reversed(reconstruct_path(parents[1], meeting)[:-1]))
+    return [packing.unpack(key) for key in path], "Solution found!"
+
+# IDA* with Manhattan distance plus linear conflicts (linear memory, for 4x4 and 5x5)
+def line_conflicts(goal_offsets):
+    """
+    Linear-conflict penalty of one row or column: goal_offsets are the goal
+    positions within the line of the tiles that belong to it, in their
+    current order. Every tile outside a longest increasing subsequence must
+    leave the line and come back, which costs 2 extra moves.
+    """
+    tails = []
+    for offset in goal_offsets:
+        i = bisect_left(tails, offset)
+        if i == len(tails):
+            tails.append(offset)
+        else:
+            tails[i] = offset
+    return 2 * (len(goal_offsets) - len(tails))
+
+def manhattan_conflict_tracker(tiles, goal_state):
+    """
+    Manhattan distance plus linear conflicts of tiles (a flat list that the
+    search mutates), as (h, apply, undo) like PatternDatabase.tracker.
+    apply(tile, source, destination) is called after the move.
+    """
+    n = len(goal_state)
+    cells = range(n * n)
+    goal_cell = [0] * (n * n)
+    for cell, tile in enumerate(tile for row in goal_state for tile in row):
+        goal_cell[tile] = cell
+    # distance[tile][cell]: Manhattan distance of tile at cell from its goal cell
+    distance = [[abs(cell // n - goal_cell[tile] // n) + abs(cell % n - goal_cell[tile] % n) for cell in cells]
+                for tile in cells]
+    distance[0] = [0] * (n * n)
+    goal_row = [goal_cell[tile] // n for tile in cells]
+    goal_col = [goal_cell[tile] % n for tile in cells]
+
+    # Line scores are memoized on the goal offsets of the line's own tiles:
+    # ordered selections of distinct offsets, so at most 326 keys for n = 5
+    cache = {}
+
+    def conflicts(goal_offsets):
+        score = cache.get(goal_offsets)
+        if score is None:
+            score = cache[goal_offsets] = line_conflicts(goal_offsets)
+        return score
+
+    def row_conflicts(r):
+        return conflicts(tuple([goal_col[tile] for tile in tiles[r * n:(r + 1) * n] if tile and goal_row[tile] == r]))
+
+    def col_conflicts(c):
+        return conflicts(tuple([goal_row[tile] for tile in tiles[c::n] if tile and goal_col[tile] == c]))
+
+    row_lc = [row_conflicts(r) for r in range(n)]
+    col_lc = [col_conflicts(c) for c in range(n)]
+
+    def apply(tile, source, destination):
+        delta = distance[tile][destination] - distance[tile][source]
+        if source % n == destination % n:
+            # Vertical move: the tile changes row
+            first, second, line, lc, score = source // n, destination // n, goal_row[tile], row_lc, row_conflicts
+        else:
+            first, second, line, lc, score = source % n, destination % n, goal_col[tile], col_lc, col_conflicts
+        # Only the tile's own goal line can change score: other lines ignore it
+        if line != first and line != second:
+            return delta, None
+        old_score = lc[line]
+        lc[line] = score(line)
+        return delta + lc[line] - old_score, (lc, line, old_score)
+
+    def undo(token):
+        if token is not None:
+            lc, line, old_score = token
+            lc[line] = old_score
+
+    h = sum(distance[tile][cell] for cell, tile in enumerate(tiles)) + sum(row_lc) + sum(col_lc)
+    return h, apply, undo
+
+def ida_star_n_puzzle(initial_state, goal_state, stats=None, pdb=None):
+    """
+    Iterative-deepening A* with Manhattan distance plus linear conflicts, or
+    the tables of pdb (a PatternDatabase for goal_state). Memory is linear
+    in the solution depth. If stats is a dict it receives 'nodes' and
+    'iterations'. Returns (path of states, message) like bfs_n_puzzle.
+    """
+    if not is_solvable(initial_state, goal_state):
+        return None, "This puzzle is unsolvable."
+    if pdb is not None and pdb.goal_state != goal_state:
+        raise ValueError("pattern database was built for a different goal")
+
+    n = len(initial_state)
+    tiles = [tile for row in initial_state for tile in row]
+    goal_tiles = [tile for row in goal_state for tile in row]
+    if pdb is not None:
+        h, apply, undo = pdb.tracker(tiles)
+    else:
+        h, apply, undo = manhattan_conflict_tracker(tiles, goal_state)
+    moves = PackedPuzzle(n).moves
+    path = []  # Blank cell after each move
+    nodes = 0
+    next_bound = 0
+
+    def search(g, bound, blank, previous, h):
+        nonlocal nodes, next_bound
+        f = g + h
+        if f > bound:
+            if f < next_bound:
+                next_bound = f
+            return False
+        if h == 0 and tiles == goal_tiles:
+            return True
+        nodes += 1
+        for target, _, _ in moves[blank]:
+            if target == previous:
+                continue  # Never undo the previous move
+            tile = tiles[target]
+            tiles[blank], tiles[target] = tile, 0
+            delta, token = apply(tile, target, blank)
+
+            path.append(target)
+            if search(g + 1, bound, target, blank, h + delta):
+                return True
+            path.pop()
+            undo(token)
+            tiles[blank], tiles[target] = 0, tile
+        return False
+
+    # Each iteration is a depth-first search bounded by f = g + h; the next
+    # bound is the smallest f that exceeded the current one.
+    start_blank = tiles.index(0)
+    bound = h
+    iterations = 0
+    while True:
+        iterations += 1
+        next_bound = float("inf")
+        found = search(0, bound, start_blank, -1, h)
+        if found or next_bound == float("inf"):
+            break
+        bound = next_bound
+
+    if stats is not None:
+        stats["nodes"] = nodes
+        stats["iterations"] = iterations
+    if not found:
+        return None, "Solution not found (shouldn't happen for solvable puzzles)."
+
+    # Replay the blank moves to rebuild the states
+    states = [initial_state]
+    tiles = [tile for row in initial_state for tile in row]
+    blank = start_blank
+    for target in path:
+        tiles[blank], tiles[target] = tiles[target], 0
+        blank = target
+        states.append(tuple(tuple(tiles[r * n:(r + 1) * n]) for r in range(n)))
+    return states, "Solution found!"
+
+# Additive pattern databases (only pattern-tile moves are counted)
+def rank_cells(cells, num_cells):
+    """Lexicographic rank of a k-permutation of cells among all k-permutations
+    of range(num_cells): digit i is cells[i] minus the smaller cells used before it."""
+    rank = 0
+    used = 0
+    for i, cell in enumerate(cells):
+        rank = rank * (num_cells - i) + cell - bin(used & ((1 << cell) - 1)).count("1")
+        used |= 1 << cell
+    return rank
+
+def default_partitions(goal_state):
+    """
+    Splits the tiles, in goal reading order, into groups: 6-6-3 for 4x4,
+    4-4 for 3x3, 5-5-5-5-4 for 5x5 (6-tile groups would need 127M-entry
+    tables there) and groups of at most 4 otherwise.
+    """
+    n = len(goal_state)
+    tiles = [tile for row in goal_state for tile in row if tile != 0]
+    sizes = {3: (4, 4), 4: (6, 6, 3), 5: (5, 5, 5, 5, 4)}.get(n) or [4] * ((len(tiles) + 3) // 4)
+    partitions = []
+    for size in sizes:
+        partitions.append(tuple(tiles[:size]))
+        tiles = tiles[size:]
+    return [pattern for pattern in partitions if pattern]
+
+def _build_pattern_table(task):
+    """Returns the distance table of one pattern as bytes, indexed by the
+    rank_cells of the pattern tiles' cells."""
+    # Backward breadth-first search from the goal over the pattern tiles plus
+    # the blank; the other tiles are indistinguishable. A blank move onto a
+    # non-pattern cell is free and a pattern-tile move costs 1, so distances
+    # of disjoint patterns add up to an admissible heuristic.
+    import numpy as np
+    n, start_cells = task
+    num_cells, k = n * n, len(start_cells) - 1  # start_cells ends with the blank
+    size = 1
+    for i in range(k + 1):
+        size *= num_cells - i
+    neighbors = np.full((num_cells, 4), -1, dtype=np.int64)
+    for cell in range(num_cells):
+        r, c = divmod(cell, n)
+        for d, (dr, dc) in enumerate([(0, 1), (0, -1), (1, 0), (-1, 0)]):
+            if 0 <= r + dr < n and 0 <= c + dc < n:
+                neighbors[cell, d] = (r + dr) * n + c + dc
+
+    def rank(cells):
+        ranks = np.zeros(len(cells), dtype=np.int64)
+        for i in range(k + 1):
+            digit = cells[:, i].astype(np.int64)
+            for j in range(i):
+                digit -= cells[:, j] < cells[:, i]
+            ranks = ranks * (num_cells - i) + digit
+        return ranks
+
+    def successors(cells, tile_moves):
+        """Free blank moves, or (tile_moves) moves of a pattern tile into the blank."""
+        occupied = np.zeros(len(cells), dtype=np.int64)
+        for i in range(k):
+            occupied |= np.left_shift(1, cells[:, i].astype(np.int64))
+        blank = cells[:, k].astype(np.int64)
+        result = []
+        for d in range(4):
+            target = neighbors[blank, d]
+            legal = target >= 0
+            hits_tile = (np.right_shift(occupied, np.where(legal, target, 0)) & 1) == 1
+            chosen = legal & (hits_tile if tile_moves else ~hits_tile)
+            children = cells[chosen]
+            if tile_moves:
+                moved = children[:, :k] == target[chosen, None]
+                children[:, :k] = np.where(moved, blank[chosen, None], children[:, :k])
+            children[:, k] = target[chosen]
+            result.append(children)
+        return np.concatenate(result)
+
+    table = np.full(size, 255, dtype=np.uint8)
+    chunk = 1 << 16
+
+    def visit(frontier, tile_moves, depth):
+        """Marks the unseen successors of frontier with depth and returns them."""
+        found = []
+        for begin in range(0, len(frontier), chunk):
+            children = successors(frontier[begin:begin + chunk], tile_moves)
+            ranks = rank(children)
+            fresh = table[ranks] == 255
+            ranks, first = np.unique(ranks[fresh], return_index=True)
+            table[ranks] = depth
+            found.append(children[fresh][first])
+        return np.concatenate(found) if found else frontier[:0]
+
+    # Level by level: free moves are closed within a level before the next
+    # level is generated. States are ranked with the blank as the last cell.
+    frontier = np.array([start_cells], dtype=np.uint8)
+    table[rank(frontier)] = 0
+    depth = 0
+    while len(frontier):
+        level = [frontier]
+        while len(level[-1]):
+            level.append(visit(level[-1], False, depth))
+        frontier = visit(np.concatenate(level), True, depth + 1)
+        depth += 1
+    # The stored table keeps the minimum over the blank's cell
+    return table.reshape(-1, num_cells - k).min(axis=1).tobytes()
+
+class PatternDatabase:
+    """
+    Disjoint additive pattern databases for one goal layout. Pattern p holds
+    the tiles partitions[p]; tables[p][rank_cells(cells of those tiles)] is
+    the number of pattern-tile moves needed to bring them home in the
+    relaxed model, so the sum over patterns never overestimates. Tables are
+    one byte per entry; load() memory-maps them so that several solver
+    processes share one copy through the page cache.
+    """
+    MAGIC = b'NPZPDB01'
+    HEADER = struct.Struct('<qq')  # n, number of patterns
+
+    def __init__(self, goal_state, partitions, tables):
+        self.goal_state = goal_state
+        self.n = len(goal_state)
+        self.partitions = [tuple(pattern) for pattern in partitions]
+        self.tables = tables
+        self._mapped = None
+
+    @classmethod
+    def build(cls, goal_state, partitions=None, processes=None):
+        """
+        Builds one table per pattern (NumPy is needed here, not for lookups).
+        With processes > 1 the patterns are built in a multiprocessing pool.
+        """
+        if partitions is None:
+            partitions = default_partitions(goal_state)
+        n = len(goal_state)
+        goal_cell = {tile: cell for cell, tile in enumerate(tile for row in goal_state for tile in row)}
+        tasks = [(n, [goal_cell[tile] for tile in pattern] + [goal_cell[0]]) for pattern in partitions]
+        if processes is not None and processes > 1 and len(tasks) > 1:
+            import multiprocessing
+            with multiprocessing.Pool(min(processes, len(tasks))) as pool:
+                tables = pool.map(_build_pattern_table, tasks)
+        else:
+            tables = [_build_pattern_table(task) for task in tasks]
+        return cls(goal_state, partitions, tables)
+
+    def save(self, path):
+        """Writes header, goal layout, then per pattern: size, tiles, table bytes."""
+        with open(path, 'wb') as file:
+            file.write(self.MAGIC)
+            file.write(self.HEADER.pack(self.n, len(self.partitions)))
+            file.write(bytes(tile for row in self.goal_state for tile in row))
+            for pattern, table in zip(self.partitions, self.tables):
+                file.write(struct.pack('<q', len(pattern)))
+                file.write(bytes(pattern))
+                file.write(table)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-maps a file written by save(); the tables are used in place."""
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(cls.MAGIC)] != cls.MAGIC:
+            raise ValueError(f"{path} is not a pattern database file")
+        position = len(cls.MAGIC)
+        n, num_patterns = cls.HEADER.unpack_from(mapped, position)
+        position += cls.HEADER.size
+        goal = mapped[position:position + n * n]
+        goal_state = tuple(tuple(goal[r * n:(r + 1) * n]) for r in range(n))
+        position += n * n
+
+        view = memoryview(mapped)
+        partitions, tables = [], []
+        for _ in range(num_patterns):
+            (k,) = struct.unpack_from('<q', mapped, position)
+            position += 8
+            partitions.append(tuple(mapped[position:position + k]))
+            position += k
+            size = 1
+            for i in range(k):
+                size *= n * n - i
+            tables.append(view[position:position + size])
+            position += size
+        database = cls(goal_state, partitions, tables)
+        database._mapped = mapped  # Keep the mapping alive as long as the database
+        return database
+
+    def heuristic(self, state):
+        """Sum of the pattern distances of a state."""
+        cell_of = {tile: cell for cell, tile in enumerate(tile for row in state for tile in row)}
+        return sum(table[rank_cells([cell_of[tile] for tile in pattern], self.n * self.n)]
+                   for pattern, table in zip(self.partitions, self.tables))
+
+    def tracker(self, tiles):
+        """
+        Incremental form of heuristic() for a search that mutates tiles (a flat
+        list): returns (h, apply, undo). apply(tile, source, destination)
+        re-ranks only the moved tile's pattern and returns (h delta, token);
+        undo(token) restores it.
+        """
+        num_cells = self.n * self.n
+        pattern_of, slot_of = {}, {}
+        for p, pattern in enumerate(self.partitions):
+            for slot, tile in enumerate(pattern):
+                pattern_of[tile], slot_of[tile] = p, slot
+        cells = [[tiles.index(tile) for tile in pattern] for pattern in self.partitions]
+        tables = self.tables
+        values = [table[rank_cells(pattern_cells, num_cells)] for table, pattern_cells in zip(tables, cells)]
+
+        def apply(tile, source, destination):
+            p = pattern_of.get(tile)
+            if p is None:
+                return 0, None
+            pattern_cells = cells[p]
+            pattern_cells[slot_of[tile]] = destination
+            old = values[p]
+            values[p] = tables[p][rank_cells(pattern_cells, num_cells)]
+            return values[p] - old, (p, slot_of[tile], source, old)
+
+        def undo(token):
+            if token is not None:
+                p, slot, source, old = token
+                cells[p][slot] = source
+                values[p] = old
+
+        return sum(values), apply, undo
+
+# Benchmark: the two hardest 8-puzzle instances (31 moves)
+HARDEST_8_PUZZLES = [
+    ((8, 6, 7), (2, 5, 4), (3, 0, 1)),
+    ((6, 4, 7), (8, 5, 0), (3, 2, 1)),
+]
+
+def benchmark_bfs(instances=HARDEST_8_PUZZLES):
+    """Reports runtime, states visited, solution length and peak memory of
+    bidirectional_bfs_n_puzzle and bfs_n_puzzle: the process peak RSS (where
+    the resource module exists) after the timed run, and the tracemalloc
+    peak of a second run, since tracing slows the search. The smaller search
+    runs first, as peak RSS only grows."""
+    import time
+    import tracemalloc
+    goal_state = ((1, 2, 3), (4, 5, 6), (7, 8, 0))
+    results = []
+    for label, search in [("bidirectional", bidirectional_bfs_n_puzzle), ("bfs", bfs_n_puzzle)]:
+        for puzzle in instances:
+            stats = {}
+            started = time.perf_counter()
+            path, _ = search(puzzle, goal_state, stats=stats)
+            results.append((label, search, puzzle, len(path) - 1, stats["visited"],
+                            time.perf_counter() - started, peak_rss_mib()))
+
+    # tracemalloc runs come last so that they do not inflate the RSS figures
+    for label, search, puzzle, moves, visited, elapsed, rss in results:
+        tracemalloc.start()
+        search(puzzle, goal_state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{str(puzzle):36s} {label:13s} moves = {moves}  visited = {visited:6d}  time = {elapsed:.2f}s  "
+              f"peak traced = {peak / 2**20:.1f} MiB  peak RSS = {rss:.1f} MiB")
+
+def peak_rss_mib():
+    """Peak resident set size of this process in MiB (nan if unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10  # Bytes on macOS, KiB elsewhere
+
+# Benchmark: Korf's 15-puzzle instances (goal has the blank first: 0 1 2 ... 15)
+# (a few of the faster ones; pass a file with all 100 for the full set)
+KORF_INSTANCES = {
+    2: "13 5 4 10 9 12 8 14 2 3 7 1 0 15 11 6",
+    5: "4 7 14 13 10 3 9 12 11 5 6 15 1 2 8 0",
+    79: "0 1 9 7 11 13 5 3 14 12 4 2 8 6 10 15",
+}
+
+def read_korf_instances(path):
+    """Reads one instance per line: 16 tiles, optionally preceded by an index."""
+    instances = {}
+    with open(path) as file:
+        for line in file:
+            numbers = [int(token) for token in line.split()]
+            if len(numbers) == 17:
+                instances[numbers[0]] = " ".join(map(str, numbers[1:]))
+            elif len(numbers) == 16:
+                instances[len(instances) + 1] = " ".join(map(str, numbers))
+    return instances
+
+def benchmark_korf(path=None):
+    """Solves Korf's 15-puzzle instances with IDA* (the embedded easy ones,
+    or every instance in the file at path) and reports nodes/sec."""
+    import time
+    instances = read_korf_instances(path) if path else KORF_INSTANCES
+    goal_state = tuple(tuple(range(r * 4, (r + 1) * 4)) for r in range(4))
+    for number, line in instances.items():
+        tiles = [int(token) for token in line.split()]
+        puzzle = tuple(tuple(tiles[r * 4:(r + 1) * 4]) for r in range(4))
+        stats = {}
+        started = time.perf_counter()
+        path_states, _ = ida_star_n_puzzle(puzzle, goal_state, stats)
+        elapsed = time.perf_counter() - started
+        print(f"Korf #{number:<3d} moves = {len(path_states) - 1}  nodes = {stats['nodes']}  "
+              f"time = {elapsed:.2f}s  nodes/sec = {stats['nodes'] / elapsed:.0f}")
+
+def benchmark_pdb(path=None, processes=None):
+    """
+    Builds (or reuses, if path exists) the default 6-6-3 pattern databases
+    for Korf's goal, memory-maps them and compares IDA* with them against
+    Manhattan distance plus linear conflicts on the embedded Korf instances.
+    The build takes a minute or more, so the file is kept for later runs, by
+    default in the system temp directory rather than the working directory.
+    """
+    import os
+    import tempfile
+    import time
+    if path is None:
+        path = os.path.join(tempfile.gettempdir(), "korf-663.pdb")
+    goal_state = tuple(tuple(range(r * 4, (r + 1) * 4)) for r in range(4))
+    if not os.path.exists(path):
+        started = time.perf_counter()
+        PatternDatabase.build(goal_state, processes=processes or os.cpu_count()).save(path)
+        print(f"Built {path} in {time.perf_counter() - started:.1f}s ({os.path.getsize(path) / 2**20:.1f} MiB)")
+    started = time.perf_counter()
+    pdb = PatternDatabase.load(path)
+    print(f"Mapped {path} in {(time.perf_counter() - started) * 1000:.1f}ms, patterns {pdb.partitions}")
+
+    for number, line in KORF_INSTANCES.items():
+        tiles = [int(token) for token in line.split()]
+        puzzle = tuple(tuple(tiles[r * 4:(r + 1) * 4]) for r in range(4))
+        for label, database in [("manhattan+lc", None), ("pdb 6-6-3", pdb)]:
+            stats = {}
+            started = time.perf_counter()
+            path_states, _ = ida_star_n_puzzle(puzzle, goal_state, stats, pdb=database)
+            elapsed = time.perf_counter() - started
+            print(f"Korf #{number:<3d} {label:13s} moves = {len(path_states) - 1}  nodes = {stats['nodes']}  "
+                  f"time = {elapsed:.2f}s")
+
 def get_dynamic_input():
     try:
         n = int(input("Enter the size of the puzzle (e.g., 3 for a 3x3 puzzle): "))
@@ -92,9 +713,7 @@ def get_dynamic_input():
         initial_state = tuple(tuple(row) for row in puzzle)
 
         # Create the goal state dynamically
-        goal_list = list(range(1, n*n))
-        goal_list.append(0)
-        goal_state = tuple(tuple(goal_list[i*n : (i+1)*n]) for i in range(n))
+        goal_state = goal_state_for(n)
 
         return initial_state, goal_state
     
@@ -104,7 +723,17 @@ def get_dynamic_input():
     
 # --- Main Execution ---
 
-if __name__ == "__main__":
+if __name__ == "__main__" and sys.argv[1:2] == ["--bench"]:
+    # python N_puzzle_bfs.py --bench [bfs | korf [instances.txt] | pdb [tables.pdb]]
+    # The pdb benchmark builds large tables, so it only runs when asked for
+    which = sys.argv[2] if len(sys.argv) > 2 else None
+    if which in (None, "bfs"):
+        benchmark_bfs()
+    if which in (None, "korf"):
+        benchmark_korf(sys.argv[3] if which and len(sys.argv) > 3 else None)
+    if which == "pdb":
+        benchmark_pdb(*sys.argv[3:4])
+elif __name__ == "__main__":
     initial_state, goal_state = get_dynamic_input()
 
     if initial_state and goal_state:
@@ -117,7 +746,11 @@ if __name__ == "__main__":
             print(row)
 
         print("\nStarting search...")
-        solution_path, message = bfs_n_puzzle(initial_state, goal_state)
+        if len(initial_state) >= 4:
+            # Breadth-first search cannot hold a 4x4 state space; IDA* needs linear memory
+            solution_path, message = ida_star_n_puzzle(initial_state, goal_state)
+        else:
+            solution_path, message = bfs_n_puzzle(initial_state, goal_state, verbose=True)
 
         if solution_path:
             print(message)
@@ -157,6 +157,13 @@
 
 
 
+import heapq
+import random
+import sys
+import time
+from array import array
+from collections import deque
+
 # Cost to find the AND and OR path
 def Cost(H, condition, weight=1):
     cost = {}
@@ -173,51 +180,633 @@ def Cost(H, condition, weight=1):
         cost[Path_B] = PathB
     return cost
 
-# Update the cost
-def update_cost(H, Conditions, weight=1):
+# Update the cost (verbose prints each node's connector costs)
+def update_cost(H, Conditions, weight=1, verbose=False):
     Main_nodes = list(Conditions.keys())
     Main_nodes.reverse()
     least_cost = {}
     for key in Main_nodes:
         condition = Conditions[key]
-        print(key, ':', Conditions[key], '>>>', Cost(H, condition, weight))
+        if verbose:
+            print(key, ':', Conditions[key], '>>>', Cost(H, condition, weight))
         c = Cost(H, condition, weight)
         H[key] = min(c.values())
         least_cost[key] = Cost(H, condition, weight)
     return least_cost
 
+# Structured solution graph
+class SolutionGraph:
+    """
+    Solution graph of an AND-OR search: maps every node reached from the
+    root to its chosen connector (kind, children), or None for a terminal.
+    Shared subproblems are stored once, so the graph is linear in the size
+    of the solution; the text form is only built when render() is called.
+    """
+    def __init__(self, root, choices, costs):
+        self.root = root
+        self.choices = choices  # Format: {node: ('OR', (child,)) / ('AND', (child, ...)) / None}
+        self.costs = costs      # Format: {node: cost}
+        self._rendered = None
+
+    def __len__(self):
+        return len(self.choices)
+
+    def __str__(self):
+        return self.render()
+
+    def render(self):
+        """Text form, e.g. 'A=(C AND D) [C=(H AND I) [H + I] + D = J]'.
+        A node shared by several branches is spelled out once, then named."""
+        if self._rendered is None:
+            parts = []
+            written = set()
+            stack = [(False, self.root)]  # (is_text, node or text)
+            while stack:
+                is_text, item = stack.pop()
+                if is_text:
+                    parts.append(item)
+                    continue
+                choice = self.choices.get(item)
+                if choice is None or item in written:
+                    parts.append(item)
+                    continue
+                written.add(item)
+                kind, children = choice
+                if kind == 'OR':
+                    parts.append(item + ' = ')
+                    stack.append((False, children[0]))
+                else:
+                    parts.append(item + '=(' + ' AND '.join(children) + ') [')
+                    stack.append((True, ']'))
+                    for i, child in enumerate(reversed(children)):
+                        if i:
+                            stack.append((True, ' + '))
+                        stack.append((False, child))
+            self._rendered = ''.join(parts)
+        return self._rendered
+
+def _build_solution_graph(root, choose):
+    """Visits each node reachable through the chosen connectors exactly once.
+    choose(node) returns (connector or None, cost)."""
+    choices, costs = {}, {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node in choices:
+            continue
+        choices[node], costs[node] = choose(node)
+        if choices[node] is not None:
+            stack.extend(child for child in choices[node][1] if child not in choices)
+    return SolutionGraph(root, choices, costs)
+
+def extract_solution_graph(Start, Updated_cost, H, weight=1):
+    """Builds the SolutionGraph from the output of update_cost."""
+    def choose(node):
+        if node not in Updated_cost:
+            return None, H[node]
+        path, cost = min(Updated_cost[node].items(), key=lambda item: item[1])
+        if ' AND ' in path:
+            return ('AND', tuple(path.split(' AND '))), cost
+        # An OR group: follow its cheapest child
+        child = min(path.split(' OR '), key=lambda child: H[child] + weight)
+        return ('OR', (child,)), cost
+    return _build_solution_graph(Start, choose)
+
 # Print the shortest path
 def shortest_path(Start, Updated_cost, H):
-    Path = Start
-    if Start in Updated_cost.keys():
-        Min_cost = min(Updated_cost[Start].values())
-        key = list(Updated_cost[Start].keys())
-        values = list(Updated_cost[Start].values())
-        Index = values.index(Min_cost)
-        
-        # FIND MINIMUM PATH KEY
-        Next = key[Index].split()
-        # ADD TO PATH FOR OR PATH
-        if len(Next) == 1:
-            Start = Next[0]
-            Path += ' = ' + shortest_path(Start, Updated_cost, H)
-        # ADD TO PATH FOR AND PATH
+    return extract_solution_graph(Start, Updated_cost, H).render()
+
+# Incremental AO* solver
+class AOStar:
+    """
+    AO* search over an acyclic AND-OR graph in the Conditions format, or a
+    function node -> condition (None for a terminal) that generates successors
+    on demand. Use CompiledAndOrGraph.solve for cyclic graphs.
+    """
+    def __init__(self, conditions, H, weight=1):
+        self.successors = conditions.get if isinstance(conditions, dict) else conditions
+        self.H = H
+        self.weight = weight
+        self.cost = {}        # Revised cost of every expanded node
+        self.connectors = {}  # Format: {node: [('OR', (child,)), ('AND', (child, ...)), ...]}
+        self.best = {}        # Format: {node: index of its best connector}
+        self.parents = {}     # Format: {child: set of expanded parents}
+        self.solved = set()
+        self.expansions = 0
+        self.revisions = 0
+
+    def estimate(self, node):
+        """Revised cost if node is expanded, heuristic value otherwise."""
+        return self.cost[node] if node in self.cost else self.H[node]
+
+    def connector_cost(self, connector):
+        kind, children = connector
+        return sum(self.estimate(child) + self.weight for child in children)
+
+    def expand(self, node):
+        """Generates the connectors of node and registers it as their parent.
+        Raises ValueError if a child is node itself or one of its ancestors."""
+        self.expansions += 1
+        condition = self.successors(node) or {}
+        connectors = [('OR', (child,)) for child in condition.get('OR', [])]
+        if 'AND' in condition:
+            connectors.append(('AND', tuple(condition['AND'])))
+        # Only an expanded child has descendants, so only it can lead back to node
+        ancestors = None
+        for _, children in connectors:
+            for child in children:
+                if child != node and child not in self.connectors:
+                    continue
+                if ancestors is None:
+                    ancestors = self.ancestors(node)
+                if child in ancestors:
+                    raise ValueError(f'AND-OR graph has a cycle through {node!r} and {child!r}; '
+                                     'use CompiledAndOrGraph.solve() for cyclic graphs')
+        self.connectors[node] = connectors
+        for _, children in connectors:
+            for child in children:
+                self.parents.setdefault(child, set()).add(node)
+
+    def ancestors(self, node):
+        """Returns node and every expanded node above it."""
+        seen, stack = {node}, [node]
+        while stack:
+            for parent in self.parents.get(stack.pop(), ()):
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        return seen
+
+    def revise(self, node):
+        """Recomputes cost, best connector and SOLVED label of one expanded node.
+        Returns True if any of them changed."""
+        self.revisions += 1
+        connectors = self.connectors[node]
+        if not connectors:
+            new_cost, new_best, new_solved = self.H[node], None, True
         else:
-            Path += '=('+key[Index]+') '
-            Start = Next[0]
-            Path += '[' + shortest_path(Start, Updated_cost, H) + ' + '
-            Start = Next[-1]
-            Path += shortest_path(Start, Updated_cost, H) + ']'
-    
-    return Path
+            costs = [self.connector_cost(connector) for connector in connectors]
+            new_cost = min(costs)
+            new_best = costs.index(new_cost)
+            new_solved = all(child in self.solved for child in connectors[new_best][1])
+
+        changed = (self.cost.get(node) != new_cost or self.best.get(node) != new_best
+                   or (node in self.solved) != new_solved)
+        self.cost[node] = new_cost
+        self.best[node] = new_best
+        if new_solved:
+            self.solved.add(node)
+        else:
+            self.solved.discard(node)
+        return changed
+
+    def propagate(self, node):
+        """Revises node, then its ancestors, stopping wherever nothing changes."""
+        pending = deque([node])
+        queued = {node}
+        while pending:
+            current = pending.popleft()
+            queued.discard(current)
+            if self.revise(current):
+                for parent in self.parents.get(current, ()):
+                    if parent not in queued:
+                        pending.append(parent)
+                        queued.add(parent)
+
+    def unexpanded_tip(self, start):
+        """Finds an unexpanded, unsolved node of the current best partial solution graph."""
+        stack, seen = [start], set()
+        while stack:
+            node = stack.pop()
+            if node in seen or node in self.solved:
+                continue
+            seen.add(node)
+            if node not in self.connectors:
+                return node
+            best = self.best[node]
+            if best is not None:
+                stack.extend(reversed(self.connectors[node][best][1]))
+        return None
+
+    def solve(self, start):
+        """Runs AO* from start and returns its revised cost."""
+        # Each step expands one tip of the current best partial solution graph
+        # and revises costs upwards only as far as costs or SOLVED labels
+        # change. Terminals are SOLVED with cost H[node]; a node is SOLVED once
+        # every child of its best connector is.
+        while start not in self.solved:
+            node = self.unexpanded_tip(start)
+            if node is None:
+                break  # The best partial solution graph cannot be completed
+            self.expand(node)
+            self.propagate(node)
+        return self.cost.get(start, self.H[start])
+
+    def best_connector(self, node):
+        """Returns the chosen (kind, children) connector of node, or None for a terminal."""
+        best = self.best.get(node)
+        return None if best is None else self.connectors[node][best]
+
+    def solution_graph(self, start):
+        """Returns the SolutionGraph of the best connectors below start."""
+        return _build_solution_graph(start, lambda node: (self.best_connector(node), self.estimate(node)))
+
+    def least_cost(self):
+        """Returns the expanded nodes' connector costs in the format of update_cost."""
+        least_cost = {}
+        for node, connectors in self.connectors.items():
+            if not connectors:
+                continue
+            cost = {}
+            or_children = [children[0] for kind, children in connectors if kind == 'OR']
+            if 'AND' in (kind for kind, _ in connectors):
+                and_children = connectors[-1][1]
+                cost[' AND '.join(and_children)] = self.connector_cost(connectors[-1])
+            if or_children:
+                cost[' OR '.join(or_children)] = min(self.estimate(child) + self.weight for child in or_children)
+            least_cost[node] = cost
+        return least_cost
+
+# Compiled AND-OR graph with interned node ids
+class CompiledAndOrGraph:
+    """
+    Array-backed form of a Conditions graph. Node names are interned to
+    integer ids and connectors live in flat arrays: the connectors of node v
+    are connector_offsets[v]..connector_offsets[v + 1], and the children of
+    connector k are children[child_offsets[k]:child_offsets[k + 1]]. Each OR
+    child is its own single-child connector; the AND list is one connector.
+    An empty AND list has no agreed cost and raises ValueError.
+    """
+    def __init__(self, Conditions, H, weight=1):
+        names = list(Conditions)
+        ids = {name: i for i, name in enumerate(names)}
+        for name, condition in Conditions.items():
+            if 'AND' in condition and not condition['AND']:
+                raise ValueError(f'node {name!r} has an empty AND connector')
+            for child in condition.get('OR', []) + condition.get('AND', []):
+                if child not in ids:
+                    ids[child] = len(names)
+                    names.append(child)
+        self.names = names
+        self.ids = ids
+        self.weight = weight
+        self.heuristic = array('d', (H.get(name, 0) for name in names))
+
+        self.connector_offsets = array('q', [0])
+        self.connector_kinds = array('b')   # 0 = OR, 1 = AND
+        self.connector_owners = array('i')
+        self.child_offsets = array('q', [0])
+        self.children = array('i')
+        for node, name in enumerate(names):
+            condition = Conditions.get(name, {})
+            groups = [(0, (child,)) for child in condition.get('OR', [])]
+            if 'AND' in condition:
+                groups.append((1, condition['AND']))
+            for kind, group in groups:
+                self.connector_kinds.append(kind)
+                self.connector_owners.append(node)
+                self.children.extend(ids[child] for child in group)
+                self.child_offsets.append(len(self.children))
+            self.connector_offsets.append(len(self.connector_kinds))
+
+        # Reverse index: the connectors each node appears in
+        counts = array('q', bytes(8 * (len(names) + 1)))
+        for child in self.children:
+            counts[child + 1] += 1
+        for node in range(len(names)):
+            counts[node + 1] += counts[node]
+        self.occurrence_offsets = counts
+        self.occurrences = array('i', bytes(4 * len(self.children)))
+        fill = counts[:-1]
+        for connector in range(len(self.connector_kinds)):
+            for i in range(self.child_offsets[connector], self.child_offsets[connector + 1]):
+                child = self.children[i]
+                self.occurrences[fill[child]] = connector
+                fill[child] += 1
+
+        self.cost = None
+        self.best = None
+
+    def solve(self):
+        """
+        Least fixpoint of cost(v) = min over connectors of sum(cost(child) + weight),
+        with terminal nodes fixed at their heuristic value. Costs are settled
+        in increasing order (Knuth's generalization of Dijkstra), so every
+        node is finalized once and the solver terminates on cyclic graphs;
+        nodes that can only be solved through a cycle keep an infinite cost.
+        Requires weight >= 0. Returns the cost array.
+        """
+        num_nodes = len(self.names)
+        infinity = float('inf')
+        weight = self.weight
+        # The hot loop runs on lists unpacked from the arrays
+        connector_offsets, connector_owners = self.connector_offsets, self.connector_owners.tolist()
+        occurrence_offsets, occurrences = self.occurrence_offsets.tolist(), self.occurrences.tolist()
+        child_offsets, heuristic = self.child_offsets, self.heuristic
+        cost = [infinity] * num_nodes
+        best = [-1] * num_nodes
+        remaining = [child_offsets[k + 1] - child_offsets[k] for k in range(len(child_offsets) - 1)]
+        partial = [0.0] * len(remaining)
+        final = [False] * num_nodes
+
+        # Terminal costs are known upfront, so they are sorted once and merged
+        # with the heap instead of being pushed through it (-1 ends the list)
+        terminals = [node for node in range(num_nodes) if connector_offsets[node] == connector_offsets[node + 1]]
+        for node in terminals:
+            cost[node] = heuristic[node]
+        terminals.sort(key=cost.__getitem__)
+        terminals.append(-1)
+        next_terminal, position = terminals[0], 0
+        frontier = []
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        while True:
+            if frontier and (next_terminal < 0 or frontier[0][0] < cost[next_terminal]):
+                node_cost, node = heappop(frontier)
+                if final[node]:
+                    continue
+            elif next_terminal >= 0:
+                node, node_cost = next_terminal, cost[next_terminal]
+                position += 1
+                next_terminal = terminals[position]
+            else:
+                break
+            final[node] = True
+            step = node_cost + weight
+            for connector in occurrences[occurrence_offsets[node]:occurrence_offsets[node + 1]]:
+                remaining[connector] -= 1
+                if remaining[connector]:
+                    partial[connector] += step
+                    continue
+                # Last child settled: the connector's cost is final
+                value = partial[connector] + step
+                owner = connector_owners[connector]
+                if value < cost[owner] and not final[owner]:
+                    cost[owner] = value
+                    best[owner] = connector
+                    heappush(frontier, (value, owner))
+
+        cost, best = array('d', cost), array('i', best)
+        self.cost, self.best = cost, best
+        return cost
+
+    def topological_levels(self):
+        """
+        Groups the nodes by height: level 0 holds the terminal nodes and a
+        node sits one level above its highest child. Returns (order, offsets)
+        where the nodes of level L are order[offsets[L]:offsets[L + 1]].
+        Raises ValueError if the graph has a cycle.
+        """
+        num_nodes = len(self.names)
+        connector_offsets, child_offsets = self.connector_offsets, self.child_offsets
+        pending = array('i', (child_offsets[connector_offsets[node + 1]] - child_offsets[connector_offsets[node]]
+                              for node in range(num_nodes)))
+        order = array('i', (node for node in range(num_nodes) if pending[node] == 0))
+        offsets = array('q', [0, len(order)])
+        while offsets[-1] > offsets[-2]:
+            for i in range(offsets[-2], offsets[-1]):
+                node = order[i]
+                for j in range(self.occurrence_offsets[node], self.occurrence_offsets[node + 1]):
+                    owner = self.connector_owners[self.occurrences[j]]
+                    pending[owner] -= 1
+                    if pending[owner] == 0:
+                        order.append(owner)
+            offsets.append(len(order))
+        offsets.pop()
+        if len(order) < num_nodes:
+            raise ValueError('AND-OR graph has a cycle; use solve() for cyclic graphs')
+        return order, offsets
+
+    def solve_batch(self, heuristics, weights=None):
+        """
+        Solves one scenario per row of heuristics, shape (scenarios,
+        len(self.names)); weights is a scalar or one per scenario. Returns
+        (cost, best) of shape (len(self.names), scenarios), best being the
+        chosen connector (-1 at terminals). Acyclic graphs only.
+        """
+        import numpy as np
+        heuristics = np.asarray(heuristics, dtype=np.float64)
+        if heuristics.ndim != 2 or heuristics.shape[1] != len(self.names):
+            raise ValueError(f'heuristics must have shape (scenarios, {len(self.names)})')
+        weights = np.broadcast_to(np.asarray(self.weight if weights is None else weights, dtype=np.float64),
+                                  heuristics.shape[:1])
+        order, offsets = self.topological_levels()
+        order = np.frombuffer(order, dtype=np.int32)
+        connector_offsets = np.frombuffer(self.connector_offsets, dtype=np.int64)
+        child_offsets = np.frombuffer(self.child_offsets, dtype=np.int64)
+        children = np.frombuffer(self.children, dtype=np.int32)
+
+        cost = np.ascontiguousarray(heuristics.T)
+        best = np.full(cost.shape, -1, dtype=np.int32)
+        # One bottom-up pass over the topological levels; each level is
+        # evaluated with reduceat over all its connectors and scenarios at once
+        for level in range(1, len(offsets) - 1):
+            nodes = order[offsets[level]:offsets[level + 1]]
+            # Connectors of this level, grouped by owner (ranges are contiguous per node)
+            first, last = connector_offsets[nodes], connector_offsets[nodes + 1]
+            per_node = last - first
+            connectors = np.repeat(first - np.cumsum(per_node) + per_node, per_node) + np.arange(per_node.sum())
+            # Children of those connectors, flattened, and the start of each group
+            starts, ends = child_offsets[connectors], child_offsets[connectors + 1]
+            sizes = ends - starts
+            flat = np.repeat(starts - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+            group_starts = np.cumsum(sizes) - sizes
+            connector_cost = np.add.reduceat(cost[children[flat]] + weights, group_starts, axis=0)
+            # Cheapest connector per node; ties go to the first one
+            node_starts = np.cumsum(per_node) - per_node
+            node_cost = np.minimum.reduceat(connector_cost, node_starts, axis=0)
+            is_min = connector_cost == np.repeat(node_cost, per_node, axis=0)
+            candidates = np.where(is_min, connectors[:, None], np.iinfo(np.int32).max)
+            cost[nodes] = node_cost
+            best[nodes] = np.minimum.reduceat(candidates, node_starts, axis=0)
+        return cost, best
+
+    def best_connector(self, name):
+        """Returns the chosen (kind, children) connector of a node, or None."""
+        connector = self.best[self.ids[name]]
+        if connector < 0:
+            return None
+        kind = 'AND' if self.connector_kinds[connector] else 'OR'
+        children = self.children[self.child_offsets[connector]:self.child_offsets[connector + 1]]
+        return kind, tuple(self.names[child] for child in children)
+
+    def solution_graph(self, start):
+        """Returns the SolutionGraph below start (solve() must have run)."""
+        return _build_solution_graph(start, lambda name: (self.best_connector(name), self.cost[self.ids[name]]))
+
+# Batch evaluation of one Conditions graph under many heuristic vectors
+class BatchSolution:
+    """
+    Result of batch_update_cost: cost[v, s] and best[v, s] hold the cost and
+    chosen connector id of node v in scenario s (ids as in graph.names).
+    """
+    def __init__(self, graph, root, cost, best):
+        self.graph = graph
+        self.root = root
+        self.cost = cost
+        self.best = best
+
+    def __len__(self):
+        return self.cost.shape[1]
+
+    @property
+    def root_cost(self):
+        """Cost of the root in every scenario."""
+        return self.cost[self.graph.ids[self.root]]
+
+    def best_connector(self, scenario, name):
+        """Returns the chosen (kind, children) connector of a node, or None."""
+        graph = self.graph
+        connector = int(self.best[graph.ids[name], scenario])
+        if connector < 0:
+            return None
+        kind = 'AND' if graph.connector_kinds[connector] else 'OR'
+        children = graph.children[graph.child_offsets[connector]:graph.child_offsets[connector + 1]]
+        return kind, tuple(graph.names[child] for child in children)
+
+    def chosen_connectors(self, scenario):
+        """Maps every internal node of the scenario's solution graph to its connector."""
+        choices = self.solution_graph(scenario).choices
+        return {node: choice for node, choice in choices.items() if choice is not None}
+
+    def solution_graph(self, scenario):
+        """Returns the SolutionGraph of one scenario."""
+        ids = self.graph.ids
+        return _build_solution_graph(self.root, lambda name: (self.best_connector(scenario, name),
+                                                              float(self.cost[ids[name], scenario])))
+
+# Graph shared by the worker processes of batch_update_cost
+_batch_graph = None
+
+def _init_batch_worker(graph):
+    global _batch_graph
+    _batch_graph = graph
+
+def _batch_shard(task):
+    heuristics, weights = task
+    return _batch_graph.solve_batch(heuristics, weights)
+
+def batch_update_cost(Conditions, heuristics, weight=1, root=None, processes=None):
+    """
+    Evaluates update_cost for many scenarios at once, without copying or
+    mutating any H. heuristics is a sequence of H dicts or a 2-D array with
+    one row per scenario and columns in CompiledAndOrGraph(Conditions, {}).names
+    order; weight is a scalar or one weight per scenario. root defaults to
+    the first key of Conditions, which must be acyclic.
+    With processes > 1 the scenarios are split across a multiprocessing pool.
+    Returns a BatchSolution (root_cost, chosen_connectors(scenario), ...).
+    """
+    import numpy as np
+    graph = CompiledAndOrGraph(Conditions, {})
+    if not hasattr(heuristics, 'shape'):
+        heuristics = [[H.get(name, 0) for name in graph.names] for H in heuristics]
+    heuristics = np.asarray(heuristics, dtype=np.float64)
+    weights = np.broadcast_to(np.asarray(weight, dtype=np.float64), heuristics.shape[:1])
+    graph.topological_levels()  # Fail on cycles before starting any workers
+
+    if processes is not None and processes > 1 and len(heuristics) > 1:
+        import multiprocessing
+        bounds = np.linspace(0, len(heuristics), min(processes, len(heuristics)) + 1).astype(int)
+        tasks = [(heuristics[lo:hi], weights[lo:hi]) for lo, hi in zip(bounds, bounds[1:])]
+        with multiprocessing.Pool(processes, initializer=_init_batch_worker, initargs=(graph,)) as pool:
+            shards = pool.map(_batch_shard, tasks)
+        cost = np.concatenate([shard_cost for shard_cost, _ in shards], axis=1)
+        best = np.concatenate([shard_best for _, shard_best in shards], axis=1)
+    else:
+        cost, best = graph.solve_batch(heuristics, weights)
+    return BatchSolution(graph, next(iter(Conditions)) if root is None else root, cost, best)
+
+# Benchmark: string-keyed update_cost against the compiled fixpoint solver
+def generate_and_or_graph(num_nodes, seed=0, cyclic=False):
+    """
+    Random Conditions graph whose keys are in topological order (so that
+    update_cost gives the exact answer), plus heuristic values. About a third
+    of the nodes are terminal. With cyclic, some back edges are added.
+    """
+    rng = random.Random(seed)
+    names = [f'N{i}' for i in range(num_nodes)]
+    internal = num_nodes * 2 // 3
+    Conditions = {}
+    for i in range(internal):
+        later = lambda: names[rng.randrange(i + 1, num_nodes)]
+        condition = {'OR': [later() for _ in range(rng.randint(1, 3))]}
+        if rng.random() < 0.5:
+            condition['AND'] = [later() for _ in range(rng.randint(2, 3))]
+        if cyclic and i > 0 and rng.random() < 0.1:
+            condition['OR'].append(names[rng.randrange(i)])
+        Conditions[names[i]] = condition
+    H = {name: rng.randint(0, 10) for name in names}
+    return Conditions, H
+
+def benchmark_compiled(num_nodes=100000, seed=0):
+    Conditions, H = generate_and_or_graph(num_nodes, seed)
+    print(f'\nAND-OR benchmark: {num_nodes} nodes')
+
+    started = time.perf_counter()
+    H_string = dict(H)
+    update_cost(H_string, Conditions)
+    print(f'  {"string-keyed update_cost":26s} time = {time.perf_counter() - started:.2f}s')
+
+    started = time.perf_counter()
+    graph = CompiledAndOrGraph(Conditions, H)
+    compile_time = time.perf_counter() - started
+    started = time.perf_counter()
+    cost = graph.solve()
+    solve_time = time.perf_counter() - started
+    matches = all(cost[graph.ids[name]] == H_string[name] for name in Conditions)
+    print(f'  {"compiled fixpoint solver":26s} time = {solve_time:.2f}s (+ {compile_time:.2f}s compile)  '
+          f'same costs = {matches}')
+
+    Conditions, H = generate_and_or_graph(num_nodes, seed, cyclic=True)
+    started = time.perf_counter()
+    cost = CompiledAndOrGraph(Conditions, H).solve()
+    print(f'  {"cyclic graph (compiled)":26s} time = {time.perf_counter() - started:.2f}s  '
+          f'root cost = {cost[0]}')
+
+def benchmark_batch(num_nodes=10000, scenarios=100, seed=0):
+    Conditions, H = generate_and_or_graph(num_nodes, seed)
+    rng = random.Random(seed)
+    heuristics = [{name: rng.randint(0, 10) for name in H} for _ in range(scenarios)]
+    print(f'\nBatch benchmark: {num_nodes} nodes x {scenarios} heuristic vectors')
+
+    started = time.perf_counter()
+    root_costs = []
+    for H in heuristics:
+        H = dict(H)
+        update_cost(H, Conditions)
+        root_costs.append(H['N0'])
+    print(f'  {"update_cost per scenario":28s} time = {time.perf_counter() - started:.2f}s')
+
+    for processes in (None, 2):
+        started = time.perf_counter()
+        result = batch_update_cost(Conditions, heuristics, processes=processes)
+        label = 'batch_update_cost' + (f' ({processes} procs)' if processes else '')
+        print(f'  {label:28s} time = {time.perf_counter() - started:.2f}s  '
+              f'same root costs = {result.root_cost.tolist() == root_costs}')
+
+def run_benchmarks(names):
+    """Runs the named benchmarks (all of them if none are given)."""
+    benchmarks = {
+        "compiled": benchmark_compiled,
+        "batch": benchmark_batch,
+    }
+    for name in names or benchmarks:
+        benchmarks[name]()
 
 # Additional Code for Visualization
 
-import networkx as nx
-import matplotlib.pyplot as plt
+# Visualization of the graph based on the provided conditions.
+# networkx and matplotlib are imported here rather than at module level, so
+# importing the solver stays fast and works without them installed.
+def visualize_graph(conditions, updated_cost, H, output_path=None):
+    """Draws the AND-OR graph. With output_path the figure is written to that
+    file without opening a window (headless); otherwise it is shown."""
+    import networkx as nx
+    import matplotlib
+    if output_path is not None and 'matplotlib.pyplot' not in sys.modules:
+        matplotlib.use('Agg')  # Non-interactive backend: no display needed
+    import matplotlib.pyplot as plt
 
-# Visualization of the graph based on the provided conditions
-def visualize_graph(conditions, updated_cost, H):
     G = nx.DiGraph()
 
     # Add nodes and edges
@@ -238,30 +827,43 @@ def visualize_graph(conditions, updated_cost, H):
     nx.draw(G, pos, with_labels=True, node_color='lightblue', node_size=2000, font_size=10, font_weight='bold', edge_color=colors, arrows=True)
     nx.draw_networkx_edge_labels(G, pos, edge_labels=labels, font_color='red')
     plt.title('AND-OR Path Graph with Heuristics')
-    plt.show()
-
-# Example Usage:
-
-# Heuristic values of Nodes  
-H1 = {'A': 1, 'B': 4, 'C': 2, 'D': 3, 'E': 6, 'F': 8, 'G': 2, 'H': 0, 'I': 0, 'J': 1}
-
-Conditions = {
- 'A': {'OR': ['B'], 'AND': ['C', 'D']},
- 'B': {'OR': ['E', 'F']},
- 'C': {'OR': ['G'], 'AND': ['H', 'I']},
- 'D': {'OR': ['J']}
-}
-
-# Weight
-weight = 1
-
-# Updated cost
-print('Updated Cost:')
-Updated_cost = update_cost(H1, Conditions, weight=1)
-print('*' * 75)
-
-# Shortest Path
-print('Shortest Path:\n', shortest_path('A', Updated_cost, H1))
-
-# Visualize the graph
-visualize_graph(Conditions, Updated_cost, H1)
\ No newline at end of file
+    if output_path is not None:
+        plt.savefig(output_path)
+        plt.close()
+    else:
+        plt.show()
+
+# Example Usage (python ao_star_algorithm.py [--save graph.png] | --bench [compiled|batch]):
+if __name__ == "__main__" and sys.argv[1:2] == ["--bench"]:
+    run_benchmarks(sys.argv[2:])
+elif __name__ == "__main__":
+    # Heuristic values of Nodes  
+    H1 = {'A': 1, 'B': 4, 'C': 2, 'D': 3, 'E': 6, 'F': 8, 'G': 2, 'H': 0, 'I': 0, 'J': 1}
+
+    Conditions = {
+     'A': {'OR': ['B'], 'AND': ['C', 'D']},
+     'B': {'OR': ['E', 'F']},
+     'C': {'OR': ['G'], 'AND': ['H', 'I']},
+     'D': {'OR': ['J']}
+    }
+
+    # Weight
+    weight = 1
+
+    # Incremental AO* (run before update_cost, which overwrites H1 in place)
+    solver = AOStar(Conditions, dict(H1), weight)
+    print('AO* cost of A:', solver.solve('A'), '| nodes expanded:', solver.expansions)
+    print('AO* solution graph:', solver.solution_graph('A'))
+    print('*' * 75)
+
+    # Updated cost
+    print('Updated Cost:')
+    Updated_cost = update_cost(H1, Conditions, weight=1, verbose=True)
+    print('*' * 75)
+
+    # Shortest Path
+    print('Shortest Path:\n', shortest_path('A', Updated_cost, H1))
+
+    # Visualize the graph (saved to a file instead of shown with --save)
+    output_path = sys.argv[sys.argv.index('--save') + 1] if '--save' in sys.argv[:-1] else None
+    visualize_graph(Conditions, Updated_cost, H1, output_path)
@@ -1,71 +1,487 @@
 import sys
 
-def is_valid(assignment, words, result):
+# Opt-in tracing for the backtracking solver
+TRACE_OFF, TRACE_SUMMARY, TRACE_NODE = 0, 1, 2
+
+class Tracer:
     """
-    Checks if a partial assignment is consistent with the constraints.
-    A partial assignment is valid if:
-    1. All assigned letters have unique digit values.
-    2. The first letter of each word is not 0.
+    Leveled trace of solve_cryptarithmetic. TRACE_SUMMARY writes the
+    equation check, the solution and the node count; TRACE_NODE also writes
+    one line per tentative assignment, or every sample_every-th one. Lines
+    are collected and written to stream (default sys.stdout) in blocks of
+    buffer_lines, and on flush(). Pass tracer=None (the default) for no trace.
     """
-    
-    # Check for unique digit assignments
-    if len(set(assignment.values())) != len(assignment.values()):
-        return False
+    def __init__(self, level=TRACE_SUMMARY, stream=None, sample_every=1, buffer_lines=1000):
+        self.level = level
+        self.stream = stream
+        self.sample_every = sample_every
+        self.buffer_lines = buffer_lines
+        self.nodes = 0
+        self.lines = []
 
-    # Check that the first letter of a word is not 0
-    if assignment.get(words[0][0], None) == 0:
-        return False
-    if assignment.get(words[1][0], None) == 0:
-        return False
-    if assignment.get(result[0], None) == 0:
-        return False
+    def node(self, letter, digit, order, digits, count):
+        """One tentative assignment; the assignment so far is order/digits[:count]."""
+        self.nodes += 1
+        if self.nodes % self.sample_every == 0:
+            self.write(f"Trying to assign '{letter}' = {digit}. "
+                       f"Current assignment: {dict(zip(order[:count], digits))}")
+
+    def summary(self, text):
+        if self.level >= TRACE_SUMMARY:
+            self.write(text)
 
-    return True
+    def write(self, line):
+        self.lines.append(line)
+        if len(self.lines) >= self.buffer_lines:
+            self.flush()
 
-def solve_cryptarithmetic(letters, words, result, assignment):
+    def flush(self):
+        if self.lines:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("\n".join(self.lines) + "\n")
+            stream.flush()
+            self.lines = []
+
+def solve_cryptarithmetic(letters, words, result, assignment, stats=None, tracer=None):
     """
     Recursive backtracking function to solve the puzzle.
+    If stats is a dict, stats['nodes'] receives the number of assignments tried.
+    tracer is an optional Tracer; without one the search writes nothing.
     """
-    
-    # Base Case: All letters have been assigned a value
-    if not letters:
-        if evaluate(assignment, words, result):
-            print("\n--- Solution Found ---")
-            print(f"Final assignment: {assignment}")
-            return assignment
-        return None
-    
-    # Get the next unassigned letter
-    letter = letters[0]
-    remaining_letters = letters[1:]
-    
-    # Try assigning a digit from 0 to 9 to the letter
-    for digit in range(10):
-        new_assignment = assignment.copy()
-        new_assignment[letter] = digit
-        
-        # Check if the partial assignment is valid
-        if is_valid(new_assignment, words, result):
-            sys.stdout.write(f"\nTrying to assign '{letter}' = {digit}. Current assignment: {new_assignment}")
-            sys.stdout.flush()
-            
-            # Recurse with the new assignment
-            solution = solve_cryptarithmetic(remaining_letters, words, result, new_assignment)
-            if solution:
-                return solution
-    
-    return None
+    # Fixed-size state: digits[i] is the digit of order[i] (-1 while
+    # unassigned) and used a bitmask of the digits taken. Digits are written
+    # in place and undone on backtrack, so a node allocates nothing.
+    order = list(assignment) + list(letters)
+    position = {letter: i for i, letter in enumerate(order)}
+    digits = [assignment.get(letter, -1) for letter in order]
+    used = 0
+    for digit in assignment.values():
+        used |= 1 << digit
+    nonzero = bytearray(len(order))
+    for word in words + [result]:
+        nonzero[position[word[0]]] = 1
+    # A full assignment is checked with place values (words positive, the
+    # result negative) instead of building the numbers
+    place_values = [0] * len(order)
+    for sign, word in [(1, word) for word in words] + [(-1, result)]:
+        for power, letter in enumerate(reversed(word)):
+            place_values[position[letter]] += sign * 10 ** power
+    size = len(order)
+    nodes = 0
+    # Bound once, so the untraced inner loop only pays for an `is not None` check
+    trace_node = tracer.node if tracer is not None and tracer.level >= TRACE_NODE else None
+
+    def search(depth, used):
+        nonlocal nodes
+        # Base Case: All letters have been assigned a value
+        if depth == size:
+            total = 0
+            for i in range(size):
+                total += place_values[i] * digits[i]
+            return total == 0
+
+        # Try assigning a digit from 0 to 9 to the next letter
+        for digit in range(1 if nonzero[depth] else 0, 10):
+            if used >> digit & 1:
+                continue
+            digits[depth] = digit
+            nodes += 1
+            if trace_node is not None:
+                trace_node(order[depth], digit, order, digits, depth + 1)
+
+            # Recurse with the digit set, undo it if that fails
+            if search(depth + 1, used | 1 << digit):
+                return True
+        digits[depth] = -1
+        return False
+
+    found = search(len(assignment), used)
+    if stats is not None:
+        stats['nodes'] = nodes
+    solution = dict(zip(order, digits)) if found else None
+    if tracer is not None:
+        if found:
+            evaluate(solution, words, result, tracer)
+            tracer.summary("--- Solution Found ---")
+            tracer.summary(f"Final assignment: {solution}")
+        tracer.summary(f"Searched {nodes} nodes")
+        tracer.flush()
+    return solution
 
-def evaluate(assignment, words, result):
+def evaluate(assignment, words, result, tracer=None):
     """
     Evaluates the full equation based on the final assignment.
+    The check is reported to tracer (a Tracer) if one is given.
     """
-    num1 = int("".join([str(assignment[letter]) for letter in words[0]]))
-    num2 = int("".join([str(assignment[letter]) for letter in words[1]]))
+    numbers = [int("".join([str(assignment[letter]) for letter in word])) for word in words]
     res = int("".join([str(assignment[letter]) for letter in result]))
     
-    print(f"\nEquation check: {num1} + {num2} == {res}")
-    return num1 + num2 == res
+    if tracer is not None:
+        tracer.summary(f"Equation check: {' + '.join(map(str, numbers))} == {res}")
+    return sum(numbers) == res
+
+# Generic CSP engine: bitmask domains, n-ary constraints, propagation queue
+def values_of(mask):
+    """Values whose bits are set in a domain bitmask, in increasing order."""
+    values = []
+    while mask:
+        low = mask & -mask
+        values.append(low.bit_length() - 1)
+        mask ^= low
+    return values
+
+class Constraint:
+    """
+    Base class of n-ary constraints. variables holds the indices of the
+    variables the constraint watches. propagate(domains) narrows their
+    bitmask domains in place and returns the variables it changed, or None
+    if the constraint can no longer be satisfied.
+    """
+    def __init__(self, variables):
+        self.variables = tuple(variables)
+
+    def propagate(self, domains):
+        raise NotImplementedError
+
+class AllDifferent(Constraint):
+    """
+    value + offset is different for every variable (offsets default to 0).
+    A fixed variable removes its value from the other domains, and the open
+    domains together must still hold as many values as there are open variables.
+    """
+    def __init__(self, variables, offsets=None):
+        super().__init__(variables)
+        offsets = list(offsets) if offsets is not None else [0] * len(self.variables)
+        lowest = min(offsets, default=0)
+        self.shifts = [offset - lowest for offset in offsets]
+
+    def propagate(self, domains):
+        changed = []
+        while True:
+            fixed = 0
+            open_variables = []
+            for variable, shift in zip(self.variables, self.shifts):
+                mask = domains[variable]
+                if mask & (mask - 1):
+                    open_variables.append((variable, shift))
+                else:
+                    if fixed & (mask << shift):
+                        return None
+                    fixed |= mask << shift
+            union = 0
+            newly_fixed = False
+            for variable, shift in open_variables:
+                mask = domains[variable]
+                pruned = mask & ~(fixed >> shift)
+                if pruned == 0:
+                    return None
+                if pruned != mask:
+                    domains[variable] = pruned
+                    changed.append(variable)
+                    newly_fixed = newly_fixed or pruned & (pruned - 1) == 0
+                union |= pruned << shift
+            if bin(union).count("1") < len(open_variables):
+                return None
+            if not newly_fixed:
+                return changed
+
+class LinearEquation(Constraint):
+    """
+    sum(coefficient * value) == 0, or == 0 (mod modulus) when a modulus is
+    given. The exact form prunes every open variable to the values that the
+    bounds of the other terms can still balance; the modular form is checked
+    once all variables are fixed and filters the last open variable.
+    """
+    def __init__(self, coefficients, modulus=None):
+        super().__init__(coefficients)
+        self.coefficients = [coefficients[variable] for variable in self.variables]
+        self.modulus = modulus
+
+    def propagate(self, domains):
+        if self.modulus is not None:
+            return self._propagate_modular(domains)
+        bounds = []
+        low = high = 0
+        for variable, coefficient in zip(self.variables, self.coefficients):
+            mask = domains[variable]
+            smallest, largest = (mask & -mask).bit_length() - 1, mask.bit_length() - 1
+            if coefficient < 0:
+                smallest, largest = largest, smallest
+            bounds.append((variable, coefficient, coefficient * smallest, coefficient * largest))
+            low += coefficient * smallest
+            high += coefficient * largest
+        if low > 0 or high < 0:
+            return None
+        changed = []
+        for variable, coefficient, term_low, term_high in bounds:
+            mask = domains[variable]
+            if mask & (mask - 1) == 0:
+                continue
+            rest_low, rest_high = low - term_low, high - term_high
+            pruned = 0
+            for value in values_of(mask):
+                if rest_low + coefficient * value <= 0 <= rest_high + coefficient * value:
+                    pruned |= 1 << value
+            if pruned == 0:
+                return None
+            if pruned != mask:
+                domains[variable] = pruned
+                changed.append(variable)
+        return changed
+
+    def _propagate_modular(self, domains):
+        total, open_variable, open_coefficient = 0, None, 0
+        for variable, coefficient in zip(self.variables, self.coefficients):
+            mask = domains[variable]
+            if mask & (mask - 1):
+                if open_variable is not None:
+                    return ()
+                open_variable, open_coefficient = variable, coefficient
+            else:
+                total += coefficient * (mask.bit_length() - 1)
+        if open_variable is None:
+            return () if total % self.modulus == 0 else None
+        mask = domains[open_variable]
+        pruned = 0
+        for value in values_of(mask):
+            if (total + open_coefficient * value) % self.modulus == 0:
+                pruned |= 1 << value
+        if pruned == 0:
+            return None
+        if pruned == mask:
+            return ()
+        domains[open_variable] = pruned
+        return (open_variable,)
+
+class CSP:
+    """
+    Finite-domain constraint problem. Values are small non-negative integers
+    and each domain is a bitmask over them. solutions() backtracks over the
+    variable with the fewest values left (ties: most constraints), and after
+    every assignment runs a propagation queue that re-runs each constraint
+    watching a changed variable until nothing changes.
+    """
+    def __init__(self):
+        self.names = []
+        self.domains = []
+        self.constraints = []
+        self.watchers = []  # Constraint indices per variable
+        self.nodes = 0
+
+    def add_variable(self, name, values):
+        """Adds a variable and returns its index."""
+        mask = 0
+        for value in values:
+            mask |= 1 << value
+        self.names.append(name)
+        self.domains.append(mask)
+        self.watchers.append([])
+        return len(self.names) - 1
+
+    def add_constraint(self, constraint):
+        for variable in constraint.variables:
+            self.watchers[variable].append(len(self.constraints))
+        self.constraints.append(constraint)
+
+    def propagate(self, domains, queue):
+        """Runs the constraints in queue (and those they wake up) to a fixpoint."""
+        constraints, watchers = self.constraints, self.watchers
+        queued = bytearray(len(constraints))
+        for index in queue:
+            queued[index] = 1
+        while queue:
+            index = queue.pop()
+            queued[index] = 0
+            changed = constraints[index].propagate(domains)
+            if changed is None:
+                return False
+            for variable in changed:
+                for woken in watchers[variable]:
+                    if not queued[woken]:
+                        queued[woken] = 1
+                        queue.append(woken)
+        return True
+
+    def solutions(self):
+        """Yields every solution as {name: value}."""
+        domains = list(self.domains)
+        if 0 in domains or not self.propagate(domains, list(range(len(self.constraints)))):
+            return
+        for solution in self._search(domains):
+            yield {name: mask.bit_length() - 1 for name, mask in zip(self.names, solution)}
+
+    def solve(self):
+        """Returns the first solution, or None."""
+        return next(self.solutions(), None)
+
+    def first_branch(self):
+        """
+        Returns (variable, values) for the first choice the search makes after
+        propagating the initial domains, so the top of the tree can be split
+        across workers; (None, []) if there is no choice to make.
+        """
+        domains = list(self.domains)
+        if 0 in domains or not self.propagate(domains, list(range(len(self.constraints)))):
+            return None, []
+        variable = self._choose(domains)
+        if variable is None:
+            return None, []
+        return variable, values_of(domains[variable])
+
+    def restrict(self, variable, value):
+        """Fixes a variable to one value (used to solve a single branch)."""
+        self.domains[variable] &= 1 << value
+
+    def _choose(self, domains):
+        open_variables = [variable for variable, mask in enumerate(domains) if mask & (mask - 1)]
+        if not open_variables:
+            return None
+        watchers = self.watchers
+        return min(open_variables, key=lambda v: (bin(domains[v]).count("1"), -len(watchers[v])))
+
+    def _search(self, domains):
+        self.nodes += 1
+        variable = self._choose(domains)
+        if variable is None:
+            yield domains
+            return
+        watchers = self.watchers
+        for value in values_of(domains[variable]):
+            child = list(domains)
+            child[variable] = 1 << value
+            if self.propagate(child, list(watchers[variable])):
+                yield from self._search(child)
+
+# Clients of the engine
+def compile_puzzle(words, result):
+    """
+    Turns WORD1 + WORD2 + ... = RESULT into arithmetic constraints over the
+    letters (sorted alphabetically). Column j (0 = units) contributes the
+    prefix constraint sum(coefficient * digit) == 0 (mod 10^(j+1)) over the
+    lowest j+1 columns, which is exactly what the carries into column j+1
+    allow; the last prefix is the whole equation and must be exactly 0.
+    Returns (letters, leading, prefixes) where leading is the set of letter
+    indices that may not be 0 and prefixes[j] maps letter index -> coefficient.
+    """
+    letters = sorted(set("".join(words) + result))
+    index = {letter: i for i, letter in enumerate(letters)}
+    width = max(len(word) for word in words + [result])
+    prefixes = [{} for _ in range(width)]
+    for sign, word in [(1, word) for word in words] + [(-1, result)]:
+        for position, letter in enumerate(reversed(word)):
+            for j in range(position, width):
+                coefficients = prefixes[j]
+                coefficients[index[letter]] = coefficients.get(index[letter], 0) + sign * 10 ** position
+    for coefficients in prefixes:
+        for i in [i for i, c in coefficients.items() if c == 0]:
+            del coefficients[i]
+    leading = {index[word[0]] for word in words + [result]}
+    return letters, leading, prefixes
+
+def cryptarithmetic_csp(words, result):
+    """CSP of WORD1 + WORD2 + ... = RESULT: one digit variable per letter."""
+    letters, leading, prefixes = compile_puzzle(words, result)
+    csp = CSP()
+    for i, letter in enumerate(letters):
+        csp.add_variable(letter, range(1 if i in leading else 0, 10))
+    csp.add_constraint(AllDifferent(range(len(letters))))
+    for j, coefficients in enumerate(prefixes):
+        if coefficients:
+            modulus = 10 ** (j + 1) if j < len(prefixes) - 1 else None
+            csp.add_constraint(LinearEquation(coefficients, modulus))
+    return csp
+
+def solve_with_propagation(words, result):
+    """
+    Solves WORD1 + WORD2 + ... = RESULT with the CSP engine: column carry
+    constraints, all-different forward checking and MRV/degree ordering.
+    Returns {letter: digit} or None.
+    """
+    return cryptarithmetic_csp(words, result).solve()
+
+# Exhaustive search with the top of the tree split across processes
+def _solve_branch(task):
+    build, args, variable, value = task
+    csp = build(*args)
+    if variable is not None:
+        csp.restrict(variable, value)
+    return list(csp.solutions())
+
+def parallel_solutions(build, args, processes=None):
+    """
+    Yields every solution of the CSP returned by build(*args). With
+    processes > 1 the values of the first branching variable are spread
+    over a multiprocessing pool; each worker rebuilds the CSP from args
+    (build must be a module-level function) and enumerates its branch.
+    Solutions arrive in completion order, not search order.
+    """
+    if processes is None or processes <= 1:
+        yield from build(*args).solutions()
+        return
+    variable, values = build(*args).first_branch()
+    tasks = [(build, args, variable, value) for value in values] or [(build, args, None, None)]
+    import multiprocessing
+    with multiprocessing.Pool(min(processes, len(tasks))) as pool:
+        for solutions in pool.imap_unordered(_solve_branch, tasks):
+            yield from solutions
+
+def all_solutions(words, result, processes=None):
+    """
+    Generator over every solution of WORD1 + WORD2 + ... = RESULT. A puzzle
+    is uniquely solvable when it yields exactly one solution.
+    """
+    return parallel_solutions(cryptarithmetic_csp, (list(words), result), processes)
+
+def n_queens(n):
+    """Places n queens on an n x n board; returns the column of each row, or None."""
+    csp = CSP()
+    rows = [csp.add_variable(row, range(n)) for row in range(n)]
+    csp.add_constraint(AllDifferent(rows))
+    csp.add_constraint(AllDifferent(rows, offsets=range(n)))
+    csp.add_constraint(AllDifferent(rows, offsets=[-row for row in range(n)]))
+    solution = csp.solve()
+    return [solution[row] for row in range(n)] if solution else None
+
+def graph_coloring(edges, num_colors):
+    """Colors the nodes of an undirected edge list with colors 0..num_colors-1
+    so that neighbours differ; returns {node: color} or None."""
+    csp = CSP()
+    ids = {}
+    for edge in edges:
+        for node in edge:
+            if node not in ids:
+                ids[node] = csp.add_variable(node, range(num_colors))
+    for u, v in edges:
+        csp.add_constraint(AllDifferent([ids[u], ids[v]]))
+    return csp.solve()
+
+# Benchmark: nodes per second on a small puzzle corpus
+PUZZLE_CORPUS = [
+    (["TO", "GO"], "OUT"),
+    (["TWO", "TWO"], "FOUR"),
+    (["SEND", "MORE"], "MONEY"),
+]
+
+def benchmark(corpus=PUZZLE_CORPUS):
+    """Reports nodes/sec of the plain backtracking solver (untraced) and of
+    the propagating CSP engine on each puzzle."""
+    import time
+    print(f"{'puzzle':28s} {'solver':12s} {'nodes':>9s} {'time':>9s} {'nodes/sec':>11s}")
+    for words, result in corpus:
+        name = " + ".join(words) + " = " + result
+        letters = sorted(set("".join(words) + result))
+
+        stats = {}
+        started = time.perf_counter()
+        solve_cryptarithmetic(letters, words, result, {}, stats)
+        elapsed = time.perf_counter() - started
+        print(f"{name:28s} {'backtracking':12s} {stats['nodes']:9d} {elapsed:8.3f}s {stats['nodes'] / elapsed:11.0f}")
+
+        csp = cryptarithmetic_csp(words, result)
+        started = time.perf_counter()
+        csp.solve()
+        elapsed = time.perf_counter() - started
+        print(f"{name:28s} {'csp engine':12s} {csp.nodes:9d} {elapsed:8.3f}s {csp.nodes / elapsed:11.0f}")
 
 def main():
     """
@@ -74,29 +490,26 @@ def main():
     puzzle = input("Enter the cryptarithmetic puzzle (e.g., SEND + MORE = MONEY): ")
     puzzle = puzzle.replace(" ", "").upper()
     
-    if "+" not in puzzle or "=" not in puzzle:
-        print("Invalid puzzle format. Use 'WORD1 + WORD2 = RESULT'.")
+    if "+" not in puzzle or puzzle.count("=") != 1:
+        print("Invalid puzzle format. Use 'WORD1 + WORD2 [+ ...] = RESULT'.")
         return
     
-    parts = puzzle.split('+')
-    word1 = parts[0]
-    word2_result = parts[1].split('=')
-    word2 = word2_result[0]
-    result = word2_result[1]
-    
-    words = [word1, word2]
+    left, result = puzzle.split('=')
+    words = left.split('+')
+    if not all(word.isalpha() for word in words + [result]):
+        print("Invalid puzzle format. Use 'WORD1 + WORD2 [+ ...] = RESULT'.")
+        return
     
     # Get all unique letters
-    all_letters = sorted(list(set(word1 + word2 + result)))
+    all_letters = sorted(list(set("".join(words) + result)))
     
     print("\n" + "="*50)
     print("SOLVING CRYPTARITHMETIC PUZZLE")
     print("="*50)
-    print(f"Puzzle: {word1} + {word2} = {result}")
+    print(f"Puzzle: {' + '.join(words)} = {result}")
     print(f"Unique letters to assign: {all_letters}")
     
-    initial_assignment = {}
-    solution = solve_cryptarithmetic(all_letters, words, result, initial_assignment)
+    solution = solve_with_propagation(words, result)
     
     if solution:
         print("\nSolution found!")
@@ -104,5 +517,7 @@ def main():
     else:
         print("\nNo solution found.")
 
-if __name__ == "__main__":
+if __name__ == "__main__" and sys.argv[1:2] == ["--bench"]:
+    benchmark()
+elif __name__ == "__main__":
     main()
\ No newline at end of file
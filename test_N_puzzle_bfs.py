@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from N_puzzle_bfs import (PatternDatabase, bfs_n_puzzle, bidirectional_bfs_n_puzzle, get_neighbors, goal_state_for,
+                          ida_star_n_puzzle, is_solvable)
+
+SHUFFLED_GOAL = ((1, 2, 3), (8, 0, 4), (7, 6, 5))
+
+
+def scramble(goal, moves, rng):
+    state = goal
+    for _ in range(moves):
+        state = rng.choice(get_neighbors(state))
+    return state
+
+
+def swap_two_tiles(state):
+    tiles = [tile for row in state for tile in row]
+    first, second = [i for i, tile in enumerate(tiles) if tile][:2]
+    tiles[first], tiles[second] = tiles[second], tiles[first]
+    n = len(state)
+    return tuple(tuple(tiles[r * n:(r + 1) * n]) for r in range(n))
+
+
+def assert_valid_path(path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for state, next_state in zip(path, path[1:]):
+        assert next_state in get_neighbors(state)
+
+
+@pytest.mark.parametrize("goal", [goal_state_for(3), SHUFFLED_GOAL])
+@pytest.mark.parametrize("seed", range(10))
+def test_searches_are_optimal_on_3x3(goal, seed):
+    start = scramble(goal, 40, random.Random(seed))
+    expected, _ = bfs_n_puzzle(start, goal)
+    for search in (ida_star_n_puzzle, bidirectional_bfs_n_puzzle):
+        path, _ = search(start, goal)
+        assert_valid_path(path, start, goal)
+        assert len(path) == len(expected)
+
+
+@pytest.mark.parametrize("n", [3, 4])
+def test_is_solvable_against_a_goal(n):
+    rng = random.Random(n)
+    for goal in (goal_state_for(n), scramble(goal_state_for(n), 31, rng)):
+        state = scramble(goal, 50, rng)
+        assert is_solvable(state, goal)
+        assert not is_solvable(swap_two_tiles(state), goal)
+        assert ida_star_n_puzzle(swap_two_tiles(state), goal)[0] is None
+
+
+def test_pattern_database_round_trip(tmp_path):
+    pytest.importorskip("numpy")
+    goal = SHUFFLED_GOAL
+    database = PatternDatabase.build(goal)
+    path = str(tmp_path / "tables.pdb")
+    database.save(path)
+    loaded = PatternDatabase.load(path)
+    assert loaded.goal_state == goal and loaded.partitions == database.partitions
+
+    rng = random.Random(0)
+    for _ in range(10):
+        start = scramble(goal, 40, rng)
+        expected, _ = bfs_n_puzzle(start, goal)
+        assert loaded.heuristic(start) == database.heuristic(start) <= len(expected) - 1
+        solution, _ = ida_star_n_puzzle(start, goal, pdb=loaded)
+        assert_valid_path(solution, start, goal)
+        assert len(solution) == len(expected)
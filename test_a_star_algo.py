@@ -0,0 +1,210 @@
+import multiprocessing
+import pickle
+import random
+
+import pytest
+
+from a_star_algo import (ContractionHierarchy, CSRGraph, LandmarkTable, SearchStats, a_star_nearest_goals,
+                         a_star_shortest_path, anytime_a_star, bidirectional_a_star, csr_dijkstra, grid_node_graph,
+                         load_graph, random_csr_graph, reconstruct_path, reverse_adjacency, shortest_path_matrix,
+                         validate_contraction_hierarchy)
+
+
+def write_edges(path):
+    path.write_text("A B 1\nB C 2\nA C 5\n")
+    return str(path)
+
+
+def test_pickle_mmap_loaded_graph(tmp_path):
+    path = write_edges(tmp_path / "edges.txt")
+    load_graph(path)
+    graph = load_graph(path)  # Second call memory-maps the snapshot
+    assert isinstance(graph.offsets, memoryview)
+
+    copy = pickle.loads(pickle.dumps(graph))
+    assert list(copy.offsets) == list(graph.offsets)
+    assert list(copy.targets) == list(graph.targets)
+    assert list(copy.weights) == list(graph.weights)
+    assert copy.names == graph.names
+    assert [list(copy.neighbors(node)) for node in range(len(copy))] == \
+           [list(graph.neighbors(node)) for node in range(len(graph))]
+
+
+def test_matrix_with_spawned_workers_on_mmap_graph(tmp_path):
+    path = write_edges(tmp_path / "edges.txt")
+    load_graph(path)
+    graph = load_graph(path)
+    expected, _ = shortest_path_matrix(graph, ["A", "B"], ["C"])
+    start_method = multiprocessing.get_start_method(allow_none=True)
+    multiprocessing.set_start_method("spawn", force=True)
+    try:
+        distances, _ = shortest_path_matrix(graph, ["A", "B"], ["C"], processes=2)
+    finally:
+        multiprocessing.set_start_method(start_method, force=True)
+    assert distances == expected == [[3.0], [2.0]]
+
+
+def test_load_graph_cache_depends_on_options(tmp_path):
+    path = write_edges(tmp_path / "edges.txt")
+    directed = load_graph(path)
+    bidirectional = load_graph(path, bidirectional=True)
+    assert directed.num_edges == 3
+    assert bidirectional.num_edges == 6
+    assert load_graph(path).num_edges == 3
+    assert isinstance(load_graph(path, bidirectional=True), CSRGraph)
+    assert load_graph(path, bidirectional=True).num_edges == 6
+
+
+def test_bidirectional_matches_forward_on_csr_and_dict_graphs():
+    graph = grid_node_graph(12, 12, seed=3)
+    csr_graph = CSRGraph.from_node_graph(graph)
+    reverse = reverse_adjacency(graph)
+    names = list(graph)
+    for start, goal in zip(names[::7], names[::-5]):
+        expected = a_star_shortest_path(csr_graph, start, goal)[1]
+        came_from, cost = bidirectional_a_star(csr_graph, start, goal)
+        assert cost == expected
+        assert reconstruct_path(came_from, start, goal)[0] == start
+        assert bidirectional_a_star(graph, start, goal, reverse=reverse)[1] == expected
+    assert csr_graph.reverse() is csr_graph.reverse()
+
+
+class StatusRecorder(SearchStats):
+    def __init__(self):
+        super().__init__()
+        self.statuses = []
+
+    def on_relax(self, node, neighbor, cost, g_cost, h_cost, status):
+        self.statuses.append(status)
+
+
+def test_csr_search_reports_relaxations_like_dict_search():
+    graph = grid_node_graph(6, 6, seed=1)
+    dict_stats, csr_stats = StatusRecorder(), StatusRecorder()
+    a_star_shortest_path(graph, "0,0", "5,5", stats=dict_stats)
+    a_star_shortest_path(CSRGraph.from_node_graph(graph), "0,0", "5,5", stats=csr_stats)
+    assert csr_stats.statuses
+    assert sorted(csr_stats.statuses) == sorted(dict_stats.statuses)
+
+
+@pytest.mark.parametrize("search", [
+    lambda graph, stats: bidirectional_a_star(graph, "0,0", "5,5", stats=stats),
+    lambda graph, stats: a_star_nearest_goals(graph, "0,0", ["5,5", "2,4"], k=2, stats=stats),
+    lambda graph, stats: list(anytime_a_star(graph, "0,0", "5,5", stats=stats)),
+])
+@pytest.mark.parametrize("as_csr", [False, True])
+def test_every_search_reports_each_relaxation(search, as_csr):
+    graph = grid_node_graph(6, 6, seed=1)
+    if as_csr:
+        graph = CSRGraph.from_node_graph(graph)
+    stats = StatusRecorder()
+    search(graph, stats)
+    relaxed = [status for status in stats.statuses if status != 'closed']
+    assert len(relaxed) == stats.relaxations > 0
+    assert 'new' in relaxed and 'not improved' in relaxed
+
+
+@pytest.mark.parametrize("weight_step", [0, -0.5])
+def test_anytime_a_star_rejects_non_positive_weight_step(weight_step):
+    graph = grid_node_graph(4, 4)
+    with pytest.raises(ValueError):
+        anytime_a_star(graph, "0,0", "3,3", weight_step=weight_step)
+
+
+@pytest.mark.parametrize("as_csr", [False, True])
+def test_landmark_table_round_trip(tmp_path, as_csr):
+    graph = grid_node_graph(5, 5)
+    if as_csr:
+        graph = CSRGraph.from_node_graph(graph)
+    table = LandmarkTable.build(graph, 3)
+    path = str(tmp_path / "landmarks.bin")
+    table.save(path)
+    loaded = LandmarkTable.load(path)
+    assert loaded.keys_are_names == table.keys_are_names == (not as_csr)
+
+    key = graph.node_id if as_csr else (lambda name: name)
+    goal = key("4,4")
+    for name in ("0,0", "3,0", "2,2"):
+        assert loaded.heuristic_to(goal)(key(name)) == table.heuristic_to(goal)(key(name))
+    assert a_star_shortest_path(graph, "0,0", "4,4", heuristic=loaded.heuristic_to(goal))[1] == \
+        a_star_shortest_path(graph, "0,0", "4,4")[1]
+
+
+def test_anytime_a_star_stops_once_the_path_is_proven_optimal():
+    graph = grid_node_graph(8, 8, seed=2)
+    assert list(anytime_a_star(graph, "3,3", "3,3")) == [(["3,3"], 0, 1.0)]
+    rng = random.Random(0)
+    names = list(graph)
+    for _ in range(50):
+        bounds = [bound for _, _, bound in anytime_a_star(graph, rng.choice(names), rng.choice(names))]
+        assert bounds[-1] == 1.0 and all(bound > 1.0 for bound in bounds[:-1])
+
+
+def test_save_rejects_names_that_do_not_round_trip(tmp_path):
+    graph = CSRGraph.from_edges([((0, 0), (0, 1), 1.0)])
+    with pytest.raises(TypeError):
+        graph.save(str(tmp_path / "graph.csr"))
+
+    graph = CSRGraph.from_edges([("A", 7, 1.0)])
+    graph.save(str(tmp_path / "graph.csr"))
+    assert CSRGraph.load(str(tmp_path / "graph.csr")).names == ["A", 7]
+
+
+def random_directed_graph(num_nodes=60, num_edges=240, seed=0):
+    rng = random.Random(seed)
+    edges = [(rng.randrange(num_nodes), rng.randrange(num_nodes), rng.randint(1, 20)) for _ in range(num_edges)]
+    return CSRGraph.from_edges(edges, num_nodes=num_nodes)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_contraction_hierarchy_matches_a_star(seed):
+    for graph in (random_directed_graph(seed=seed), random_csr_graph(80, 4, seed=seed),
+                  grid_node_graph(6, 6, seed=seed)):
+        hierarchy = ContractionHierarchy.build(graph)
+        assert validate_contraction_hierarchy(graph, hierarchy, num_queries=50, seed=seed) == []
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_landmark_bounds_are_admissible(tmp_path, seed):
+    graph = random_directed_graph(seed=seed)
+    path = str(tmp_path / "landmarks.bin")
+    LandmarkTable.build(graph, 4, seed=seed).save(path)
+    table = LandmarkTable.load(path)
+    reverse = graph.reverse()
+    for node in range(0, len(graph), 7):
+        to_node, from_node = csr_dijkstra(reverse, node), csr_dijkstra(graph, node)
+        heuristic_to, heuristic_from = table.heuristic_to(node), table.heuristic_from(node)
+        for v in range(len(graph)):
+            assert heuristic_to(v) <= to_node[v]
+            assert heuristic_from(v) <= from_node[v]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_nearest_goals_come_out_in_order(seed):
+    graph = random_directed_graph(seed=seed)
+    rng = random.Random(seed)
+    goals = rng.sample(range(len(graph)), 8)
+    distances = csr_dijkstra(graph, 0)
+    reachable = sorted(distances[goal] for goal in goals if distances[goal] != float('inf'))
+
+    came_from, found = a_star_nearest_goals(graph, 0, goals, k=3)
+    assert [cost for _, cost in found] == reachable[:3]
+    for goal, cost in found:
+        path = reconstruct_path(came_from, 0, goal)
+        assert path[0] == 0 and path[-1] == goal
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_anytime_a_star_respects_its_bound(seed):
+    graph = grid_node_graph(12, 12, seed=seed)
+    table = LandmarkTable.build(graph, 4, seed=seed)
+    rng = random.Random(seed)
+    names = list(graph)
+    for _ in range(20):
+        start, goal = rng.choice(names), rng.choice(names)
+        optimal = a_star_shortest_path(graph, start, goal)[1]
+        results = list(anytime_a_star(graph, start, goal, initial_weight=4.0, heuristic=table.heuristic_to(goal)))
+        for path, cost, bound in results:
+            assert path[0] == start and path[-1] == goal
+            assert cost <= bound * optimal + 1e-9
+        assert results[-1][1] == optimal
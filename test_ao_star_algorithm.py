@@ -0,0 +1,84 @@
+import pytest
+
+from ao_star_algorithm import (AOStar, CompiledAndOrGraph, batch_update_cost, extract_solution_graph,
+                               generate_and_or_graph, update_cost)
+
+EXAMPLE_H = {'A': 1, 'B': 4, 'C': 2, 'D': 3, 'E': 6, 'F': 8, 'G': 2, 'H': 0, 'I': 0, 'J': 1}
+EXAMPLE = {
+    'A': {'OR': ['B'], 'AND': ['C', 'D']},
+    'B': {'OR': ['E', 'F']},
+    'C': {'OR': ['G'], 'AND': ['H', 'I']},
+    'D': {'OR': ['J']},
+}
+
+
+def solved(Conditions, H):
+    """update_cost's cost of every node, leaving H untouched."""
+    H = dict(H)
+    update_cost(H, Conditions)
+    return H
+
+
+def test_render_example():
+    H = dict(EXAMPLE_H)
+    Updated_cost = update_cost(H, EXAMPLE)
+    assert extract_solution_graph('A', Updated_cost, H).render() == 'A=(C AND D) [C=(H AND I) [H + I] + D = J]'
+
+
+def test_render_spells_out_shared_node_once():
+    Conditions = {'A': {'AND': ['B', 'C']}, 'B': {'OR': ['D']}, 'C': {'OR': ['D']}, 'D': {'AND': ['E', 'F']}}
+    H = {name: 0 for name in 'ABCDEF'}
+    graph = CompiledAndOrGraph(Conditions, H)
+    graph.solve()
+    assert graph.solution_graph('A').render() == 'A=(B AND C) [B = D=(E AND F) [E + F] + C = D]'
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_compiled_solve_matches_update_cost(seed):
+    Conditions, H = generate_and_or_graph(30, seed=seed)
+    expected = solved(Conditions, H)
+    graph = CompiledAndOrGraph(Conditions, H)
+    cost = graph.solve()
+    assert [cost[graph.ids[name]] for name in graph.names] == [expected[name] for name in graph.names]
+    assert graph.solution_graph('N0').costs['N0'] == expected['N0']
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_ao_star_matches_update_cost_with_admissible_heuristic(seed):
+    Conditions, H = generate_and_or_graph(30, seed=seed)
+    # Internal nodes estimated at 0: a lower bound, so AO* must find the optimum
+    H = {name: 0 if name in Conditions else value for name, value in H.items()}
+    solver = AOStar(Conditions, dict(H))
+    assert solver.solve('N0') == solved(Conditions, H)['N0']
+    assert 'N0' in solver.solved
+
+
+def test_batch_update_cost_matches_update_cost():
+    pytest.importorskip('numpy')
+    for seed in range(20):
+        Conditions, H = generate_and_or_graph(30, seed=seed)
+        scenarios = [H, {name: value + 1 for name, value in H.items()}]
+        solution = batch_update_cost(Conditions, scenarios, root='N0')
+        assert list(solution.root_cost) == [solved(Conditions, H)['N0'] for H in scenarios]
+
+
+@pytest.mark.parametrize("Conditions", [
+    {'A': {'OR': ['B']}, 'B': {'OR': ['A']}},
+    {'A': {'OR': ['A']}},
+    {'A': {'AND': ['B', 'C']}, 'B': {'OR': ['C']}, 'C': {'OR': ['A']}},
+])
+def test_ao_star_rejects_cycles(Conditions):
+    with pytest.raises(ValueError):
+        AOStar(Conditions, {'A': 1, 'B': 1, 'C': 1}).solve('A')
+
+
+def test_compiled_solve_terminates_on_cycles():
+    graph = CompiledAndOrGraph({'A': {'OR': ['B', 'T']}, 'B': {'OR': ['A']}, 'C': {'OR': ['D']}, 'D': {'OR': ['C']}},
+                               {'T': 3})
+    cost = graph.solve()
+    assert [cost[graph.ids[name]] for name in 'ABTCD'] == [4, 5, 3, float('inf'), float('inf')]
+
+
+def test_compile_rejects_empty_and_connector():
+    with pytest.raises(ValueError):
+        CompiledAndOrGraph({'A': {'OR': ['B'], 'AND': []}}, {'A': 5, 'B': 2})
@@ -0,0 +1,93 @@
+import itertools
+import random
+
+import pytest
+
+from csp import CSP, AllDifferent, LinearEquation, all_solutions, graph_coloring, n_queens
+
+
+def brute_force(domains, accept):
+    return sorted(values for values in itertools.product(*domains) if accept(values))
+
+
+def csp_solutions(csp):
+    return sorted(tuple(solution[name] for name in csp.names) for solution in csp.solutions())
+
+
+def random_csp(rng, num_variables=4, max_value=5):
+    csp = CSP()
+    domains = []
+    for name in range(num_variables):
+        domain = sorted(rng.sample(range(max_value + 1), rng.randint(1, max_value + 1)))
+        csp.add_variable(name, domain)
+        domains.append(domain)
+    return csp, domains
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_all_different_with_offsets_matches_brute_force(seed):
+    rng = random.Random(seed)
+    csp, domains = random_csp(rng)
+    offsets = [rng.randint(-3, 3) for _ in domains]
+    csp.add_constraint(AllDifferent(range(len(domains)), offsets))
+    expected = brute_force(domains, lambda values: len({v + o for v, o in zip(values, offsets)}) == len(values))
+    assert csp_solutions(csp) == expected
+
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("modulus", [None, 7])
+def test_linear_equation_matches_brute_force(seed, modulus):
+    rng = random.Random(seed)
+    csp, domains = random_csp(rng)
+    coefficients = {variable: rng.choice([-3, -2, -1, 1, 2, 3]) for variable in range(len(domains))}
+    csp.add_constraint(LinearEquation(coefficients, modulus))
+
+    def accept(values):
+        total = sum(coefficients[variable] * value for variable, value in enumerate(values))
+        return total % modulus == 0 if modulus is not None else total == 0
+    assert csp_solutions(csp) == brute_force(domains, accept)
+
+
+@pytest.mark.parametrize("n", range(1, 11))
+def test_n_queens(n):
+    columns = n_queens(n)
+    if n in (2, 3):
+        assert columns is None
+        return
+    assert sorted(columns) == list(range(n))
+    for a, b in itertools.combinations(range(n), 2):
+        assert abs(columns[a] - columns[b]) != b - a
+
+
+def test_graph_coloring_petersen():
+    outer = [(i, (i + 1) % 5) for i in range(5)]
+    spokes = [(i, i + 5) for i in range(5)]
+    inner = [(5 + i, 5 + (i + 2) % 5) for i in range(5)]
+    edges = outer + spokes + inner
+    assert graph_coloring(edges, 2) is None
+    colors = graph_coloring(edges, 3)
+    assert all(colors[u] != colors[v] for u, v in edges)
+
+
+def brute_force_puzzle(words, result):
+    letters = sorted(set("".join(words) + result))
+    leading = {word[0] for word in words + [result]}
+    solutions = []
+    for digits in itertools.permutations(range(10), len(letters)):
+        assignment = dict(zip(letters, digits))
+        if any(assignment[letter] == 0 for letter in leading):
+            continue
+        value = lambda word: int("".join(str(assignment[letter]) for letter in word))
+        if sum(value(word) for word in words) == value(result):
+            solutions.append(assignment)
+    return sorted(sorted(solution.items()) for solution in solutions)
+
+
+@pytest.mark.parametrize("words, result", [
+    (["TO", "GO"], "OUT"),
+    (["TWO", "TWO"], "FOUR"),
+    (["A", "B", "C"], "DE"),
+])
+def test_all_solutions_matches_brute_force(words, result):
+    found = sorted(sorted(solution.items()) for solution in all_solutions(words, result))
+    assert found == brute_force_puzzle(words, result)